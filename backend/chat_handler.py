@@ -6,32 +6,108 @@ This module handles OpenAI chat completions with function calling for stock quer
 
 import os
 import json
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+import httpx
+from openai import AsyncOpenAI
 from backend.openai_functions import get_function_schemas, process_openai_function_call
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection pool shared by all handlers using one AsyncOpenAI client
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+HTTP_TIMEOUT = 60.0
+
+# Per-session handlers kept by get_chat_handler; the least recently used is dropped beyond this
+MAX_CHAT_SESSIONS = 1000
+
+# gpt-4's context window, and the parts of it reserved for the model's reply
+# (sent as max_tokens) and for a function result (longer results are cut)
+MODEL_CONTEXT_TOKENS = 8192
+COMPLETION_MAX_TOKENS = 1500
+FUNCTION_RESULT_MAX_TOKENS = 2000
+FUNCTION_RESULT_TRUNCATED_NOTE = "... [result truncated]"
+
+# Conversation history is kept under a rough token budget (~4 characters per token):
+# whatever the window leaves after the reservations above, the prompt prefix and the
+# new user turn, capped at HISTORY_TOKEN_BUDGET. Once it passes HISTORY_SUMMARY_THRESHOLD
+# of the budget, everything but the most recent messages is folded into a single
+# heuristic summary message.
+HISTORY_TOKEN_BUDGET = 4096
+HISTORY_SUMMARY_THRESHOLD = 0.8
+HISTORY_KEEP_RECENT = 4
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+SUMMARY_SNIPPET_CHARS = 160
+SUMMARY_MAX_LINES = 12
+# Upper bound on the size of a summary message ("- Assistant answered: " plus a snippet per line)
+SUMMARY_MAX_TOKENS = SUMMARY_MAX_LINES * (SUMMARY_SNIPPET_CHARS + 30) // 4
+
+# Function schemas are part of the cached prompt prefix, so build them once and never mutate them
+FUNCTION_SCHEMAS = get_function_schemas()
+# Rough prompt tokens the schemas take up in every request
+FUNCTION_SCHEMA_TOKENS = len(json.dumps(FUNCTION_SCHEMAS)) // 4
+
+# Base system prompt, kept byte-identical across calls for OpenAI prompt caching
+STATIC_BASE_MESSAGE = """
+You are a helpful stock recommendation assistant. You have access to a comprehensive database of stocks with financial metrics, ratings, and performance data.
+
+Your capabilities include:
+- Finding top-rated stocks (stars range 0-4)
+- Filtering stocks by industry or sector
+- Providing detailed stock analysis
+- Comparing multiple stocks
+- Advanced stock screening with multiple criteria
+- Industry overviews and market insights
+
+Available data includes:
+- Star ratings (0-4 scale)
+- Global evaluation (very negative to very positive)
+- Financial metrics (P/E ratio, ROE, market cap, etc.)
+- Performance data (YTD, 4-week performance)
+- Valuation ratings (undervalued, overvalued, etc.)
+- Industry and sector classifications
+- Dividend information
+
+When helping users:
+1. Use function calls to retrieve specific stock data
+2. Provide clear, actionable recommendations
+3. Explain the reasoning behind recommendations
+4. Consider user's risk tolerance and investment goals
+5. Be educational - explain financial terms when needed
+6. Always mention that this is for informational purposes only
+
+Be conversational and helpful, but always remind users to do their own research and consult financial advisors for investment decisions.
+"""
+
 class StockChatHandler:
     """
     Handles chat interactions with OpenAI for stock recommendations and queries.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[AsyncOpenAI] = None):
         """
         Initialize the chat handler.
 
+        The handler keeps one conversation's history, so each user session needs
+        its own instance; never share a handler between users. Handlers can share
+        one pooled client instead (see get_chat_handler).
+
         Args:
-            api_key: OpenAI API key (if None, reads from environment)
+            api_key: OpenAI API key (if None, reads from environment); ignored when client is given
+            client: Shared AsyncOpenAI client; the handler creates and owns one if None
         """
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
-        self.function_schemas = get_function_schemas()
-        self.conversation_history = []
+        self._owns_client = client is None
+        self.client = client or create_openai_client(api_key)
+        self.function_schemas = FUNCTION_SCHEMAS
+        self.conversation_history = deque()
+        self._turn_lock = asyncio.Lock()
 
-    def get_stock_recommendation(self, user_query: str, context: Optional[str] = None) -> Dict[str, Any]:
+    async def get_stock_recommendation(self, user_query: str, context: Optional[str] = None) -> Dict[str, Any]:
         """
         Get stock recommendations based on user query using OpenAI function calling.
 
@@ -42,67 +118,67 @@ class StockChatHandler:
         Returns:
             Dict containing response and any function call results
         """
-        try:
-            # Build system message
-            system_message = self._build_system_message(context)
+        # One turn at a time, so concurrent requests in a session don't interleave history updates
+        async with self._turn_lock:
+            return await self._get_stock_recommendation(user_query, context)
 
-            # Add user query to conversation
+    async def _get_stock_recommendation(self, user_query: str, context: Optional[str]) -> Dict[str, Any]:
+        """Run one chat turn; see get_stock_recommendation."""
+        try:
+            # Static prefix first, then the bounded history, then the new user turn, so
+            # everything before the new turn is byte-identical to the previous request
+            system_messages = self._build_system_messages(context)
+            self._compact_history(self._history_token_budget(system_messages, user_query))
             messages = [
-                {"role": "system", "content": system_message},
+                *system_messages,
+                *self.conversation_history,
                 {"role": "user", "content": user_query}
             ]
 
-            # Add conversation history
-            messages.extend(self.conversation_history[-6:])  # Keep last 6 messages for context
-
-            # Make OpenAI API call with function calling
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=messages,
-                functions=self.function_schemas,
-                function_call="auto",
-                temperature=0.7,
-                max_tokens=1500
-            )
-
-            message = response.choices[0].message
+            # Stream the first completion; a requested function starts running in a
+            # worker thread while the follow-up request is assembled
+            content, function_call, function_task = await self._stream_first_completion(messages)
             result = {
-                "response": message.content,
+                "response": content,
                 "function_calls": [],
                 "recommendations": []
             }
 
             # Handle function calls
-            if message.function_call:
-                function_result = process_openai_function_call({
-                    "name": message.function_call.name,
-                    "arguments": message.function_call.arguments
-                })
+            if function_call:
+                # Build the follow-up while the function is still running; resend the same
+                # schemas (with calls disabled) so it shares the cached prefix of the first request
+                follow_up_messages = [
+                    *messages,
+                    {"role": "assistant", "content": content, "function_call": function_call}
+                ]
+
+                function_result = await function_task
+                function_content = self._fit_function_result(function_result)
+                follow_up_messages.append(
+                    {"role": "function", "name": function_call["name"], "content": function_content}
+                )
 
                 result["function_calls"].append({
-                    "function": message.function_call.name,
-                    "arguments": message.function_call.arguments,
+                    "function": function_call["name"],
+                    "arguments": function_call["arguments"],
                     "result": json.loads(function_result)
                 })
 
-                # Follow up with function result
-                follow_up_messages = messages + [
-                    {"role": "assistant", "content": message.content, "function_call": message.function_call},
-                    {"role": "function", "name": message.function_call.name, "content": function_result}
-                ]
-
-                follow_up_response = self.client.chat.completions.create(
+                follow_up_response = await self.client.chat.completions.create(
                     model="gpt-4",
                     messages=follow_up_messages,
+                    functions=self.function_schemas,
+                    function_call="none",
                     temperature=0.7,
-                    max_tokens=1500
+                    max_tokens=COMPLETION_MAX_TOKENS
                 )
 
                 result["response"] = follow_up_response.choices[0].message.content
 
-            # Update conversation history
+            # Update conversation history as a user/assistant pair
             self.conversation_history.append({"role": "user", "content": user_query})
-            self.conversation_history.append({"role": "assistant", "content": result["response"]})
+            self.conversation_history.append({"role": "assistant", "content": result["response"] or ""})
 
             return result
 
@@ -113,53 +189,180 @@ class StockChatHandler:
                 "response": "I'm sorry, I encountered an error while processing your request. Please try again."
             }
 
-    def _build_system_message(self, context: Optional[str] = None) -> str:
+    async def _stream_first_completion(
+        self, messages: List[Dict[str, Any]]
+    ) -> Tuple[Optional[str], Optional[Dict[str, str]], Optional[asyncio.Task]]:
         """
-        Build system message for OpenAI chat.
+        Stream the function-calling completion and accumulate its deltas.
+
+        A requested function is started in a worker thread once the stream is
+        done (finish_reason only arrives with the final chunk, so starting it any
+        earlier gains nothing). Nothing is started if the stream fails, so no
+        task is left running unobserved.
 
         Args:
-            context: Optional user context
+            messages: Messages for the completion
 
         Returns:
-            System message string
+            Tuple of (message content, function call dict or None, task resolving to the
+            function result JSON or None)
         """
-        base_message = """
-You are a helpful stock recommendation assistant. You have access to a comprehensive database of stocks with financial metrics, ratings, and performance data.
+        stream = await self.client.chat.completions.create(
+            model="gpt-4",
+            messages=messages,
+            functions=self.function_schemas,
+            function_call="auto",
+            temperature=0.7,
+            max_tokens=COMPLETION_MAX_TOKENS,
+            stream=True
+        )
+
+        content_parts = []
+        function_name = ""
+        argument_parts = []
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                content_parts.append(delta.content)
+            if delta.function_call:
+                function_name += delta.function_call.name or ""
+                argument_parts.append(delta.function_call.arguments or "")
+
+        function_call = None
+        function_task = None
+        if function_name:
+            function_call = {"name": function_name, "arguments": "".join(argument_parts)}
+            function_task = self._start_function_call(function_name, function_call["arguments"])
+
+        return "".join(content_parts) or None, function_call, function_task
+
+    @staticmethod
+    def _start_function_call(name: str, arguments: str) -> asyncio.Task:
+        """Run a function call in a worker thread so the DataFrame work stays off the event loop."""
+        return asyncio.create_task(
+            asyncio.to_thread(process_openai_function_call, {"name": name, "arguments": arguments})
+        )
+
+    @staticmethod
+    def _estimate_tokens(content: Optional[str]) -> int:
+        """Rough token count of a message's content (~4 characters per token)."""
+        return len(content or "") // 4
+
+    @staticmethod
+    def _fit_function_result(content: str) -> str:
+        """Cut a function result to FUNCTION_RESULT_MAX_TOKENS before it is sent to the model."""
+        max_chars = FUNCTION_RESULT_MAX_TOKENS * 4
+        if len(content) <= max_chars:
+            return content
+        return content[:max_chars - len(FUNCTION_RESULT_TRUNCATED_NOTE)] + FUNCTION_RESULT_TRUNCATED_NOTE
+
+    @staticmethod
+    def _history_token_budget(system_messages: List[Dict[str, str]], user_query: str) -> int:
+        """
+        Get the tokens the conversation history may use in the next request.
 
-Your capabilities include:
-- Finding top-rated stocks (stars range 0-4)
-- Filtering stocks by industry or sector
-- Providing detailed stock analysis
-- Comparing multiple stocks
-- Advanced stock screening with multiple criteria
-- Industry overviews and market insights
+        Args:
+            system_messages: System messages the request starts with
+            user_query: New user turn
 
-Available data includes:
-- Star ratings (0-4 scale)
-- Global evaluation (very negative to very positive)
-- Financial metrics (P/E ratio, ROE, market cap, etc.)
-- Performance data (YTD, 4-week performance)
-- Valuation ratings (undervalued, overvalued, etc.)
-- Industry and sector classifications
-- Dividend information
+        Returns:
+            Token budget for the history, at most HISTORY_TOKEN_BUDGET
+        """
+        fixed_tokens = (
+            COMPLETION_MAX_TOKENS + FUNCTION_RESULT_MAX_TOKENS + FUNCTION_SCHEMA_TOKENS
+            + sum(StockChatHandler._estimate_tokens(m["content"]) for m in system_messages)
+            + StockChatHandler._estimate_tokens(user_query)
+        )
+        return max(0, min(HISTORY_TOKEN_BUDGET, MODEL_CONTEXT_TOKENS - fixed_tokens))
+
+    def _compact_history(self, token_budget: int):
+        """
+        Fold older messages into a summary once the history nears its token budget.
 
-When helping users:
-1. Use function calls to retrieve specific stock data
-2. Provide clear, actionable recommendations
-3. Explain the reasoning behind recommendations
-4. Consider user's risk tolerance and investment goals
-5. Be educational - explain financial terms when needed
-6. Always mention that this is for informational purposes only
+        The summary is built from message snippets without an extra LLM call and is
+        stored as a system message in front of the most recent messages. Fewer than
+        HISTORY_KEEP_RECENT messages are kept when those alone would not fit.
 
-Be conversational and helpful, but always remind users to do their own research and consult financial advisors for investment decisions.
-"""
+        Args:
+            token_budget: Tokens the history may use (see _history_token_budget)
+        """
+        history_tokens = sum(self._estimate_tokens(m["content"]) for m in self.conversation_history)
+        limit = HISTORY_SUMMARY_THRESHOLD * token_budget
+        if history_tokens <= limit:
+            return
+
+        # Keep whole user/assistant pairs so the retained tail starts with a user turn
+        keep_recent = HISTORY_KEEP_RECENT - HISTORY_KEEP_RECENT % 2
+        older_messages = []
+        while self.conversation_history and (
+            len(self.conversation_history) > keep_recent or history_tokens + SUMMARY_MAX_TOKENS > limit
+        ):
+            message = self.conversation_history.popleft()
+            history_tokens -= self._estimate_tokens(message["content"])
+            older_messages.append(message)
+            # Fold the rest of a pair too, so the tail never starts with an assistant turn
+            if self.conversation_history and self.conversation_history[0]["role"] == "assistant":
+                message = self.conversation_history.popleft()
+                history_tokens -= self._estimate_tokens(message["content"])
+                older_messages.append(message)
+
+        self.conversation_history.appendleft({
+            "role": "system",
+            "content": self._summarize_messages(older_messages)
+        })
+
+    @staticmethod
+    def _summarize_messages(messages: List[Dict[str, Any]]) -> str:
+        """
+        Build a heuristic summary from the leading snippet of each message.
+
+        Args:
+            messages: Messages to summarize, oldest first (may include a previous summary)
+
+        Returns:
+            Summary string with at most SUMMARY_MAX_LINES entries
+        """
+        lines = []
+        for message in messages:
+            if message["role"] == "system":
+                # Carry over the entries of a previous summary
+                lines.extend(message["content"].splitlines()[1:])
+                continue
+
+            label = "User asked" if message["role"] == "user" else "Assistant answered"
+            snippet = " ".join((message["content"] or "").split())
+            if len(snippet) > SUMMARY_SNIPPET_CHARS:
+                snippet = snippet[:SUMMARY_SNIPPET_CHARS].rstrip() + "..."
+            lines.append(f"- {label}: {snippet}")
+
+        return "\n".join([SUMMARY_HEADER] + lines[-SUMMARY_MAX_LINES:])
+
+    def _build_system_messages(self, context: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Build system messages for OpenAI chat.
+
+        The static base prompt always comes first and is sent verbatim so the
+        prompt prefix stays cacheable; user context goes into its own message.
+
+        Args:
+            context: Optional user context
+
+        Returns:
+            List of system messages
+        """
+        system_messages = [{"role": "system", "content": STATIC_BASE_MESSAGE}]
 
         if context:
-            base_message += f"\n\nUser Context: {context}"
+            system_messages.append({"role": "system", "content": f"User Context: {context}"})
 
-        return base_message
+        return system_messages
 
-    def get_industry_recommendations(self, industry: str, user_preferences: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def get_industry_recommendations(self, industry: str, user_preferences: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Get recommendations for a specific industry.
 
@@ -179,9 +382,9 @@ Be conversational and helpful, but always remind users to do their own research
             elif user_preferences.get("focus") == "dividend":
                 query += " with good dividend yields"
 
-        return self.get_stock_recommendation(query)
+        return await self.get_stock_recommendation(query)
 
-    def compare_stocks(self, stock_list: List[str]) -> Dict[str, Any]:
+    async def compare_stocks(self, stock_list: List[str]) -> Dict[str, Any]:
         """
         Compare multiple stocks.
 
@@ -192,9 +395,9 @@ Be conversational and helpful, but always remind users to do their own research
             Dict containing stock comparison
         """
         query = f"Compare these stocks for me: {', '.join(stock_list)}. Show me their key differences and which might be better investments."
-        return self.get_stock_recommendation(query)
+        return await self.get_stock_recommendation(query)
 
-    def screen_stocks(self, criteria: Dict[str, Any]) -> Dict[str, Any]:
+    async def screen_stocks(self, criteria: Dict[str, Any]) -> Dict[str, Any]:
         """
         Screen stocks based on specific criteria.
 
@@ -213,32 +416,121 @@ Be conversational and helpful, but always remind users to do their own research
             criteria_desc.append(f"with YTD performance above {criteria['min_ytd_performance']*100}%")
 
         query = f"Find stocks with {', '.join(criteria_desc) if criteria_desc else 'good fundamentals'}"
-        return self.get_stock_recommendation(query)
+        return await self.get_stock_recommendation(query)
 
     def clear_history(self):
         """Clear conversation history."""
-        self.conversation_history = []
+        self.conversation_history.clear()
+
+    async def close(self):
+        """Close the underlying HTTP connection pool if this handler created it."""
+        if self._owns_client:
+            await self.client.close()
+
+def create_openai_client(api_key: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Create an AsyncOpenAI client on a pooled httpx connection pool.
+
+    Args:
+        api_key: OpenAI API key (if None, reads from environment)
+
+    Returns:
+        AsyncOpenAI: Client that can be shared by many handlers
+    """
+    return AsyncOpenAI(
+        api_key=api_key or os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    )
+
+# Client shared by the whole process while chat_handler_lifespan is active, and the
+# per-session handlers (each with its own conversation history) built on top of it
+_shared_client: Optional[AsyncOpenAI] = None
+_session_handlers: "OrderedDict[str, StockChatHandler]" = OrderedDict()
+
+@asynccontextmanager
+async def chat_handler_lifespan(api_key: Optional[str] = None) -> AsyncIterator[AsyncOpenAI]:
+    """
+    Create the process-wide OpenAI client on startup and close its connection pool on shutdown.
+
+    Meant to back a web app's lifespan hook, so requests reuse one pooled client
+    instead of opening new connections each time. Only the client is shared;
+    conversation history stays per session (see get_chat_handler).
+
+    Args:
+        api_key: OpenAI API key (if None, reads from environment)
+
+    Yields:
+        AsyncOpenAI: The shared client
+    """
+    global _shared_client
+    client = create_openai_client(api_key)
+    _shared_client = client
+    try:
+        yield client
+    finally:
+        _shared_client = None
+        _session_handlers.clear()
+        await client.close()
+
+def get_chat_handler(session_id: str) -> StockChatHandler:
+    """
+    Return the chat handler of a session (usable as a request dependency).
+
+    Handlers are created on first use and share the lifespan's client; the
+    least recently used session is dropped once MAX_CHAT_SESSIONS are open.
+
+    Args:
+        session_id: Identifier of the user's chat session
+
+    Returns:
+        StockChatHandler: Handler holding only this session's history
+
+    Raises:
+        RuntimeError: If called outside chat_handler_lifespan
+    """
+    if _shared_client is None:
+        raise RuntimeError("Chat client is not initialized; run inside chat_handler_lifespan()")
+
+    handler = _session_handlers.get(session_id)
+    if handler is None:
+        handler = StockChatHandler(client=_shared_client)
+        _session_handlers[session_id] = handler
+        if len(_session_handlers) > MAX_CHAT_SESSIONS:
+            _session_handlers.popitem(last=False)
+    else:
+        _session_handlers.move_to_end(session_id)
+    return handler
+
+def end_chat_session(session_id: str):
+    """
+    Forget a session's handler and its conversation history.
+
+    Args:
+        session_id: Identifier of the user's chat session
+    """
+    _session_handlers.pop(session_id, None)
 
 # Example usage functions
-def example_chat_session():
+async def example_chat_session():
     """Example of how to use the StockChatHandler."""
-    handler = StockChatHandler()
-
-    # Example queries
-    queries = [
-        "Show me the top 5 highest-rated stocks",
-        "What are the best technology stocks right now?",
-        "Find undervalued stocks with good growth potential",
-        "Compare AAPL and MSFT for me",
-        "Give me an overview of the healthcare industry"
-    ]
-
-    for query in queries:
-        print(f"\n--- User Query: {query} ---")
-        result = handler.get_stock_recommendation(query)
-        print(f"Response: {result['response']}")
-        if result.get('function_calls'):
-            print(f"Function calls made: {len(result['function_calls'])}")
+    async with chat_handler_lifespan():
+        handler = get_chat_handler("example")
+
+        # Example queries
+        queries = [
+            "Show me the top 5 highest-rated stocks",
+            "What are the best technology stocks right now?",
+            "Find undervalued stocks with good growth potential",
+            "Compare AAPL and MSFT for me",
+            "Give me an overview of the healthcare industry"
+        ]
+
+        for query in queries:
+            print(f"\n--- User Query: {query} ---")
+            result = await handler.get_stock_recommendation(query)
+            print(f"Response: {result['response']}")
+            if result.get('function_calls'):
+                print(f"Function calls made: {len(result['function_calls'])}")
 
 if __name__ == "__main__":
     # Test the chat handler
@@ -246,7 +538,7 @@ if __name__ == "__main__":
 
     # Note: Requires OPENAI_API_KEY environment variable
     if os.getenv("OPENAI_API_KEY"):
-        example_chat_session()
+        asyncio.run(example_chat_session())
     else:
         print("OPENAI_API_KEY not set. Skipping chat tests.")
 
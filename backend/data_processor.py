@@ -7,7 +7,9 @@ to analyze and filter stock data from CSV files.
 
 import pandas as pd
 import os
+import hashlib
 import logging
+from pathlib import Path
 from typing import Dict, List, Optional, Any, Union
 import numpy as np
 
@@ -18,24 +20,362 @@ logger = logging.getLogger(__name__)
 # Define dataset path based on notebook structure
 DATASET_PATH = os.getenv("DATASET_PATH")
 CSV_FILE = "2025-09-23_data_EN.csv"
+# Opt-in Parquet copy of the CSV, written after the first parse to this directory
+# (never into the dataset, which may be a read-only or shared mount); unset to always parse the CSV
+PARQUET_CACHE_DIR = os.getenv("PARQUET_CACHE_DIR")
+PARQUET_SUFFIX = ".parquet"
+# Parquet schema metadata key recording the source CSV's modification time and size
+PARQUET_SOURCE_KEY = b"source_csv_stat"
+
+# Resolved once at import; also the key for mtime-based cache invalidation
+_CSV_PATH = Path(DATASET_PATH) / CSV_FILE if DATASET_PATH else None
+# The cache file name includes a hash of the CSV's path, so datasets sharing the directory don't collide
+_PARQUET_PATH = (
+    Path(PARQUET_CACHE_DIR) / (
+        f"{_CSV_PATH.name}-{hashlib.sha1(str(_CSV_PATH.resolve()).encode()).hexdigest()[:12]}{PARQUET_SUFFIX}"
+    )
+    if _CSV_PATH and PARQUET_CACHE_DIR else None
+)
+if _CSV_PATH is None:
+    logger.error("DATASET_PATH environment variable is not set; stock data will be unavailable")
+
+# Process-level cache of the parsed CSV, keyed by the file's modification time
+_stock_data_cache: Dict[str, Any] = {
+    "mtime": None, "df": None, "category_index": {}, "id_index": {}, "industry_stats": {},
+    "industries": (), "sectors": ()
+}
+
+# Columns that get a lowercased value -> row positions index at load time
+INDEXED_CATEGORY_COLUMNS = ['Industry', 'Sector']
+
+# Lowercased shadow copies of the text filter columns, computed once at load time
+LOWERCASE_COLUMNS = {'Industry': '_industry_l', 'Sector': '_sector_l'}
+
+# Global Evaluation ratings from worst to best
+EVAL_ORDER = ['very negative', 'negative', 'slightly negative', 'neutral', 'slightly positive', 'positive', 'very positive']
+# Sort rank of each rating; unknown or missing ratings rank as 'neutral'
+_EVAL_RANK = {name: rank for rank, name in enumerate(EVAL_ORDER)}
+_NEUTRAL_RANK = _EVAL_RANK['neutral']
+
+# Output key for each CSV column returned in stock listings
+STOCK_FIELD_NAMES = {
+    'Ticker': 'ticker',
+    'ISIN': 'isin',
+    'Name': 'name',
+    'Stars': 'stars',
+    'Sector': 'sector',
+    'Industry': 'industry',
+    'Price': 'price',
+    'Martket Capitalization (in $bn)': 'market_cap_bn',
+    'Global Evaluation': 'global_evaluation',
+    'Year to date performance': 'ytd_performance',
+    'Valuation rating': 'valuation_rating',
+    'Industry Global Evaluation': 'industry_global_evaluation',
+    '4 weeks performance': 'four_weeks_performance',
+    'Long Term PE': 'long_term_pe',
+    'Return On equity': 'return_on_equity',
+    'Long Term Growth': 'long_term_growth',
+    'Expected dividend': 'expected_dividend'
+}
+
+def _prepare_stock_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert rating columns to categoricals so they can be sorted and counted on integer codes.
+
+    Global Evaluation becomes an ordered categorical following EVAL_ORDER. Labels outside
+    EVAL_ORDER are kept and ranked just above 'neutral'. Stars is downcast to the
+    smallest integer type when it has no missing values, and lowercased shadow
+    columns are added for the substring filters (see LOWERCASE_COLUMNS).
+
+    Args:
+        df: Raw stock data as read from the CSV
+
+    Returns:
+        pd.DataFrame: The same frame with converted columns
+    """
+    unknown_evals = sorted(set(df['Global Evaluation'].dropna()) - set(EVAL_ORDER))
+    neutral_pos = EVAL_ORDER.index('neutral') + 1
+    eval_categories = EVAL_ORDER[:neutral_pos] + unknown_evals + EVAL_ORDER[neutral_pos:]
+    df['Global Evaluation'] = pd.Categorical(df['Global Evaluation'], categories=eval_categories, ordered=True)
+    df['Valuation rating'] = df['Valuation rating'].astype('category')
+    df['Stars'] = pd.to_numeric(df['Stars'], downcast='integer')
+    for column, lower_column in LOWERCASE_COLUMNS.items():
+        df[lower_column] = df[column].str.lower()
+    return df
+
+def _build_category_index(df: pd.DataFrame) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Build exact-match lookup tables for the categorical filter columns.
+
+    Args:
+        df: Freshly loaded stock data
+
+    Returns:
+        Dict mapping column name to {lowercased value: array of row positions}
+    """
+    positions = np.arange(len(df))
+    category_index = {}
+    for column in INDEXED_CATEGORY_COLUMNS:
+        groups = pd.Series(positions).groupby(df[LOWERCASE_COLUMNS[column]].to_numpy())
+        category_index[column] = {key: group.to_numpy() for key, group in groups}
+    return category_index
+
+def _build_id_index(df: pd.DataFrame) -> Dict[str, int]:
+    """
+    Map every ticker and ISIN to the position of the first row carrying it.
+
+    Args:
+        df: Freshly loaded stock data
+
+    Returns:
+        Dict mapping ticker or ISIN to row position
+    """
+    id_index: Dict[str, int] = {}
+    for column in ['Ticker', 'ISIN']:
+        for position, value in enumerate(df[column].tolist()):
+            if pd.notna(value) and id_index.get(value, position) >= position:
+                id_index[value] = position
+    return id_index
+
+def _matching_categories(column: str, value: str) -> List[str]:
+    """
+    Get the indexed category names that contain the given value (case insensitive).
+
+    Args:
+        column: One of INDEXED_CATEGORY_COLUMNS
+        value: Industry or sector name or part of one
+
+    Returns:
+        List of lowercased category names, in index order
+    """
+    query = str(value).lower()
+    return [name for name in _stock_data_cache["category_index"].get(column, {}) if query in name]
+
+def _category_positions(column: str, value: str) -> np.ndarray:
+    """
+    Get row positions whose column contains the given value (case insensitive).
+
+    The substring match runs over the unique category names rather than the rows,
+    and the positions of every matching category come from the index built at
+    load time, so e.g. "Banks" also returns "Regional Banks".
+
+    Args:
+        column: One of INDEXED_CATEGORY_COLUMNS
+        value: Industry or sector name or part of one
+
+    Returns:
+        np.ndarray of row positions into the stock data, in row order
+    """
+    index = _stock_data_cache["category_index"].get(column, {})
+    matching = [index[name] for name in _matching_categories(column, value)]
+    if len(matching) == 1:
+        return matching[0]
+    if not matching:
+        return np.array([], dtype=np.intp)
+    return np.sort(np.concatenate(matching))
+
+def _positions_mask(length: int, positions: np.ndarray) -> np.ndarray:
+    """Turn an array of row positions into a boolean mask of the given length."""
+    mask = np.zeros(length, dtype=bool)
+    mask[positions] = True
+    return mask
+
+def _categorical_contains(series: pd.Series, value: str) -> np.ndarray:
+    """
+    Case-insensitive substring match on a categorical column.
+
+    The match is evaluated once per category and then broadcast to the rows
+    through the integer codes; missing values never match.
+
+    Args:
+        series: Categorical column of the stock data
+        value: Substring to look for
+
+    Returns:
+        np.ndarray boolean mask aligned with series
+    """
+    categories = series.cat.categories.str.lower()
+    category_matches = np.asarray(categories.str.contains(str(value).lower(), regex=False), dtype=bool)
+    # Code -1 (missing) picks the trailing False
+    return np.append(category_matches, False)[series.cat.codes.to_numpy()]
+
+def _top_n(df: pd.DataFrame, column: str, limit: int) -> pd.DataFrame:
+    """
+    Select the rows with the largest values in a numeric column.
+
+    Equivalent to df.nlargest(limit, column) (missing values skipped, ties resolved
+    in row order) but uses an O(N) partial selection instead of a sort.
+
+    Args:
+        df: Slice of the stock data
+        column: Numeric column to rank by
+        limit: Maximum number of rows to return
+
+    Returns:
+        pd.DataFrame: Selected rows, largest first
+    """
+    return df.iloc[_top_positions(df[column].to_numpy(dtype=float, na_value=np.nan), limit)]
+
+def _top_positions(values: np.ndarray, limit: int) -> np.ndarray:
+    """
+    Positions of the largest non-NaN values, largest first and ties in position order.
+
+    Args:
+        values: Float scores, one per row
+        limit: Maximum number of positions to return
+
+    Returns:
+        np.ndarray: Selected row positions
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    k = min(limit, len(valid))
+    if k <= 0:
+        return valid[:0]
+
+    scores = values[valid]
+    kth_largest = np.partition(scores, len(scores) - k)[len(scores) - k]
+    above = valid[scores > kth_largest]
+    ties = valid[scores == kth_largest][:k - len(above)]
+    selected = np.concatenate([above, ties])
+    return selected[np.argsort(-values[selected], kind='stable')]
+
+def _evaluation_ranks(series: pd.Series) -> np.ndarray:
+    """
+    Map a Global Evaluation column to its _EVAL_RANK values.
+
+    The dict is consulted once per category rather than once per row, and the
+    per-row ranks are gathered through the categorical codes.
+
+    Args:
+        series: Global Evaluation column (categorical)
+
+    Returns:
+        np.ndarray: Float rank per row
+    """
+    category_ranks = [_EVAL_RANK.get(label, _NEUTRAL_RANK) for label in series.cat.categories]
+    # Trailing entry picks up code -1 (missing rating)
+    category_ranks = np.array(category_ranks + [_NEUTRAL_RANK], dtype=float)
+    return category_ranks[series.cat.codes.to_numpy()]
+
+def _stock_records(df: pd.DataFrame, columns: List[str]) -> List[Dict[str, Any]]:
+    """
+    Convert the selected columns of a slice into output dicts keyed by STOCK_FIELD_NAMES.
+
+    Args:
+        df: Slice of the stock data to convert
+        columns: CSV columns to include, in output order
+
+    Returns:
+        List of per-stock dicts
+    """
+    return df[columns].rename(columns=STOCK_FIELD_NAMES).to_dict('records')
+
+def _read_stock_file(csv_path: Path, parquet_path: Optional[Path], csv_stat: os.stat_result) -> pd.DataFrame:
+    """
+    Read the raw stock data, preferring a Parquet cache made from this exact CSV.
+
+    After a CSV parse the result is written to the cache so later cold starts skip
+    the CSV parser. The cache records the CSV's modification time (ns) and size and
+    is only used when both match exactly, so a replaced CSV is never shadowed, even
+    one with an older mtime. Any Parquet problem (e.g. pyarrow not installed or an
+    unwritable cache directory) falls back to the CSV.
+
+    Args:
+        csv_path: Path to the stock CSV
+        parquet_path: Path of the Parquet cache, or None when PARQUET_CACHE_DIR is unset
+        csv_stat: os.stat() result of the CSV
+
+    Returns:
+        pd.DataFrame: Raw stock data
+    """
+    source_stat = f"{csv_stat.st_mtime_ns}:{csv_stat.st_size}".encode()
+
+    if parquet_path is not None:
+        try:
+            import pyarrow.parquet as pq
+
+            if os.path.exists(parquet_path):
+                metadata = pq.read_schema(parquet_path).metadata or {}
+                if metadata.get(PARQUET_SOURCE_KEY) == source_stat:
+                    return pq.read_table(parquet_path).to_pandas()
+        except Exception as e:
+            logger.warning(f"Could not read Parquet cache {parquet_path}: {str(e)}")
+
+    df = pd.read_csv(
+        csv_path,
+        sep=";",
+        encoding="iso-8859-1"
+    )
+
+    if parquet_path is not None:
+        _write_parquet_cache(df, parquet_path, source_stat)
+
+    return df
+
+def _write_parquet_cache(df: pd.DataFrame, parquet_path: Path, source_stat: bytes):
+    """
+    Write the Parquet cache atomically, tagged with the source CSV's stat.
+
+    Failures are logged at debug level only, since an unwritable cache
+    directory just means every cold start parses the CSV.
+
+    Args:
+        df: Raw stock data parsed from the CSV
+        parquet_path: Path of the Parquet cache
+        source_stat: Encoded modification time and size of the CSV
+    """
+    tmp_path = parquet_path.with_name(f"{parquet_path.name}.tmp-{os.getpid()}")
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parquet_path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(df)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), PARQUET_SOURCE_KEY: source_stat})
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, parquet_path)
+    except Exception as e:
+        logger.debug(f"Could not write Parquet cache {parquet_path}: {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 def load_stock_data() -> pd.DataFrame:
     """
     Load stock data from CSV file with proper encoding and error handling.
 
+    The parsed DataFrame is cached for the lifetime of the process and only
+    re-read when the CSV's modification time changes. The cached frame is
+    returned directly, so callers must copy before mutating it.
+
     Returns:
         pd.DataFrame: Loaded stock data
     """
     try:
-        df = pd.read_csv(
-            DATASET_PATH + CSV_FILE,
-            sep=";",
-            encoding="iso-8859-1"
+        if _CSV_PATH is None:
+            return pd.DataFrame()
+
+        csv_stat = os.stat(_CSV_PATH)
+        mtime = csv_stat.st_mtime
+        if _stock_data_cache["df"] is not None and _stock_data_cache["mtime"] == mtime:
+            return _stock_data_cache["df"]
+
+        df = _prepare_stock_data(_read_stock_file(_CSV_PATH, _PARQUET_PATH, csv_stat))
+        category_index = _build_category_index(df)
+        id_index = _build_id_index(df)
+        industry_stats = {
+            industry: _industry_statistics(df.iloc[positions])
+            for industry, positions in category_index['Industry'].items()
+        }
+        _stock_data_cache.update(
+            mtime=mtime, df=df, category_index=category_index, id_index=id_index, industry_stats=industry_stats,
+            industries=tuple(df['Industry'].dropna().unique()), sectors=tuple(df['Sector'].dropna().unique())
         )
         logger.info(f"Successfully loaded {len(df)} stocks from CSV")
         return df
     except FileNotFoundError:
-        logger.error(f"CSV file not found at {DATASET_PATH + CSV_FILE}")
+        logger.error(f"CSV file not found at {_CSV_PATH}")
         return pd.DataFrame()
     except Exception as e:
         logger.error(f"Error loading CSV data: {str(e)}")
@@ -59,24 +399,13 @@ def get_top_stocks_by_stars(min_stars: int = 2, limit: int = 10) -> Dict[str, An
 
         # Filter by minimum stars and sort
         filtered_df = df[df['Stars'] >= min_stars].copy()
-        top_stocks = filtered_df.nlargest(limit, 'Stars')
+        top_stocks = _top_n(filtered_df, 'Stars', limit)
 
-        stocks_list = []
-        for _, row in top_stocks.iterrows():
-            stock_info = {
-                'ticker': row['Ticker'],
-                'isin': row['ISIN'],
-                'name': row['Name'],
-                'stars': row['Stars'],
-                'sector': row['Sector'],
-                'industry': row['Industry'],
-                'price': row['Price'],
-                'market_cap_bn': row['Martket Capitalization (in $bn)'],
-                'global_evaluation': row['Global Evaluation'],
-                'ytd_performance': row['Year to date performance'],
-                'valuation_rating': row['Valuation rating']
-            }
-            stocks_list.append(stock_info)
+        stocks_list = _stock_records(top_stocks, [
+            'Ticker', 'ISIN', 'Name', 'Stars', 'Sector', 'Industry', 'Price',
+            'Martket Capitalization (in $bn)', 'Global Evaluation', 'Year to date performance',
+            'Valuation rating'
+        ])
 
         return {
             "stocks": stocks_list,
@@ -107,10 +436,10 @@ def filter_stocks_by_industry(industry_name: str, sort_by: str = "Stars", limit:
             return {"error": "No data available", "stocks": []}
 
         # Filter by industry (case insensitive)
-        filtered_df = df[df['Industry'].str.contains(industry_name, case=False, na=False)].copy()
+        filtered_df = df.iloc[_category_positions('Industry', industry_name)]
 
         if filtered_df.empty:
-            available_industries = df['Industry'].unique().tolist()
+            available_industries = list(_stock_data_cache["industries"])
             return {
                 "error": f"No stocks found for industry: {industry_name}",
                 "available_industries": available_industries,
@@ -119,32 +448,18 @@ def filter_stocks_by_industry(industry_name: str, sort_by: str = "Stars", limit:
 
         # Sort by specified column
         if sort_by == "Stars":
-            sorted_df = filtered_df.nlargest(limit, 'Stars')
+            sorted_df = _top_n(filtered_df, 'Stars', limit)
         elif sort_by == "Global Evaluation":
-            # Convert text ratings to numeric for sorting
-            eval_order = ['very negative', 'negative', 'slightly negative', 'neutral', 'slightly positive', 'positive', 'very positive']
-            filtered_df['eval_rank'] = filtered_df['Global Evaluation'].map(lambda x: eval_order.index(x) if x in eval_order else 3)
-            sorted_df = filtered_df.nlargest(limit, 'eval_rank')
+            eval_ranks = _evaluation_ranks(filtered_df['Global Evaluation'])
+            sorted_df = filtered_df.iloc[_top_positions(eval_ranks, limit)]
         else:  # Year to date performance
-            sorted_df = filtered_df.nlargest(limit, 'Year to date performance')
+            sorted_df = _top_n(filtered_df, 'Year to date performance', limit)
 
-        stocks_list = []
-        for _, row in sorted_df.iterrows():
-            stock_info = {
-                'ticker': row['Ticker'],
-                'isin': row['ISIN'],
-                'name': row['Name'],
-                'industry': row['Industry'],
-                'sector': row['Sector'],
-                'stars': row['Stars'],
-                'price': row['Price'],
-                'global_evaluation': row['Global Evaluation'],
-                'industry_global_evaluation': row['Industry Global Evaluation'],
-                'ytd_performance': row['Year to date performance'],
-                'valuation_rating': row['Valuation rating'],
-                'market_cap_bn': row['Martket Capitalization (in $bn)']
-            }
-            stocks_list.append(stock_info)
+        stocks_list = _stock_records(sorted_df, [
+            'Ticker', 'ISIN', 'Name', 'Industry', 'Sector', 'Stars', 'Price', 'Global Evaluation',
+            'Industry Global Evaluation', 'Year to date performance', 'Valuation rating',
+            'Martket Capitalization (in $bn)'
+        ])
 
         return {
             "stocks": stocks_list,
@@ -176,10 +491,10 @@ def filter_stocks_by_sector(sector_name: str, sort_by: str = "Global Evaluation"
             return {"error": "No data available", "stocks": []}
 
         # Filter by sector (case insensitive)
-        filtered_df = df[df['Sector'].str.contains(sector_name, case=False, na=False)].copy()
+        filtered_df = df.iloc[_category_positions('Sector', sector_name)]
 
         if filtered_df.empty:
-            available_sectors = df['Sector'].unique().tolist()
+            available_sectors = list(_stock_data_cache["sectors"])
             return {
                 "error": f"No stocks found for sector: {sector_name}",
                 "available_sectors": available_sectors,
@@ -188,30 +503,17 @@ def filter_stocks_by_sector(sector_name: str, sort_by: str = "Global Evaluation"
 
         # Sort by specified column
         if sort_by == "Stars":
-            sorted_df = filtered_df.nlargest(limit, 'Stars')
+            sorted_df = _top_n(filtered_df, 'Stars', limit)
         elif sort_by == "Global Evaluation":
-            eval_order = ['very negative', 'negative', 'slightly negative', 'neutral', 'slightly positive', 'positive', 'very positive']
-            filtered_df['eval_rank'] = filtered_df['Global Evaluation'].map(lambda x: eval_order.index(x) if x in eval_order else 3)
-            sorted_df = filtered_df.nlargest(limit, 'eval_rank')
+            eval_ranks = _evaluation_ranks(filtered_df['Global Evaluation'])
+            sorted_df = filtered_df.iloc[_top_positions(eval_ranks, limit)]
         else:  # Year to date performance
-            sorted_df = filtered_df.nlargest(limit, 'Year to date performance')
+            sorted_df = _top_n(filtered_df, 'Year to date performance', limit)
 
-        stocks_list = []
-        for _, row in sorted_df.iterrows():
-            stock_info = {
-                'ticker': row['Ticker'],
-                'isin': row['ISIN'],
-                'name': row['Name'],
-                'sector': row['Sector'],
-                'industry': row['Industry'],
-                'stars': row['Stars'],
-                'price': row['Price'],
-                'global_evaluation': row['Global Evaluation'],
-                'ytd_performance': row['Year to date performance'],
-                'valuation_rating': row['Valuation rating'],
-                'market_cap_bn': row['Martket Capitalization (in $bn)']
-            }
-            stocks_list.append(stock_info)
+        stocks_list = _stock_records(sorted_df, [
+            'Ticker', 'ISIN', 'Name', 'Sector', 'Industry', 'Stars', 'Price', 'Global Evaluation',
+            'Year to date performance', 'Valuation rating', 'Martket Capitalization (in $bn)'
+        ])
 
         return {
             "stocks": stocks_list,
@@ -240,13 +542,13 @@ def get_stock_details(ticker_or_isin: str) -> Dict[str, Any]:
         if df.empty:
             return {"error": "No data available"}
 
-        # Search by ticker or ISIN
-        stock_row = df[(df['Ticker'] == ticker_or_isin) | (df['ISIN'] == ticker_or_isin)]
+        # Look up by ticker or ISIN
+        position = _stock_data_cache["id_index"].get(ticker_or_isin)
 
-        if stock_row.empty:
+        if position is None:
             return {"error": f"Stock not found: {ticker_or_isin}"}
 
-        row = stock_row.iloc[0]
+        row = df.iloc[position]
 
         stock_details = {
             'identifiers': {
@@ -319,32 +621,22 @@ def compare_stocks_performance(stock_list: List[str]) -> Dict[str, Any]:
         if df.empty:
             return {"error": "No data available"}
 
-        comparison_data = []
         not_found = []
+        positions = []
 
+        id_index = _stock_data_cache["id_index"]
         for stock_id in stock_list:
-            stock_row = df[(df['Ticker'] == stock_id) | (df['ISIN'] == stock_id)]
-
-            if stock_row.empty:
+            position = id_index.get(stock_id)
+            if position is None:
                 not_found.append(stock_id)
             else:
-                row = stock_row.iloc[0]
-                stock_comparison = {
-                    'ticker': row['Ticker'],
-                    'name': row['Name'],
-                    'stars': row['Stars'],
-                    'price': row['Price'],
-                    'market_cap_bn': row['Martket Capitalization (in $bn)'],
-                    'ytd_performance': row['Year to date performance'],
-                    'four_weeks_performance': row['4 weeks performance'],
-                    'long_term_pe': row['Long Term PE'],
-                    'return_on_equity': row['Return On equity'],
-                    'long_term_growth': row['Long Term Growth'],
-                    'global_evaluation': row['Global Evaluation'],
-                    'valuation_rating': row['Valuation rating'],
-                    'expected_dividend': row['Expected dividend']
-                }
-                comparison_data.append(stock_comparison)
+                positions.append(position)
+
+        comparison_data = _stock_records(df.iloc[positions], [
+            'Ticker', 'Name', 'Stars', 'Price', 'Martket Capitalization (in $bn)',
+            'Year to date performance', '4 weeks performance', 'Long Term PE', 'Return On equity',
+            'Long Term Growth', 'Global Evaluation', 'Valuation rating', 'Expected dividend'
+        ])
 
         return {
             "comparison": comparison_data,
@@ -356,6 +648,28 @@ def compare_stocks_performance(stock_list: List[str]) -> Dict[str, Any]:
         logger.error(f"Error in compare_stocks_performance: {str(e)}")
         return {"error": str(e)}
 
+def _industry_statistics(industry_df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compute the overview statistics for a slice of stocks from one industry.
+
+    Args:
+        industry_df: Rows of the stock data belonging to the industry
+
+    Returns:
+        Dict of aggregate statistics, top performers and rating distributions
+    """
+    return {
+        'total_stocks': len(industry_df),
+        'average_stars': industry_df['Stars'].mean(),
+        'average_ytd_performance': industry_df['Year to date performance'].mean(),
+        'average_market_cap_bn': industry_df['Martket Capitalization (in $bn)'].mean(),
+        'average_pe_ratio': industry_df['Long Term PE'].mean(),
+        'average_expected_dividend': industry_df['Expected dividend'].mean(),
+        'top_performers': _top_n(industry_df, 'Stars', 3)[['Ticker', 'Name', 'Stars']].to_dict('records'),
+        'evaluation_distribution': _observed_counts(industry_df['Global Evaluation']),
+        'valuation_distribution': _observed_counts(industry_df['Valuation rating'])
+    }
+
 def get_industry_overview(industry_name: str) -> Dict[str, Any]:
     """
     Get overview statistics for a specific industry.
@@ -371,24 +685,24 @@ def get_industry_overview(industry_name: str) -> Dict[str, Any]:
         if df.empty:
             return {"error": "No data available"}
 
-        # Filter by industry
-        industry_df = df[df['Industry'].str.contains(industry_name, case=False, na=False)].copy()
+        # A name matching exactly one industry is served from the statistics computed
+        # at load time; several matches are aggregated over all their rows
+        industries = _matching_categories('Industry', industry_name)
 
-        if industry_df.empty:
+        if not industries:
             return {"error": f"No stocks found for industry: {industry_name}"}
 
-        overview = {
-            'industry_name': industry_name,
-            'total_stocks': len(industry_df),
-            'average_stars': industry_df['Stars'].mean(),
-            'average_ytd_performance': industry_df['Year to date performance'].mean(),
-            'average_market_cap_bn': industry_df['Martket Capitalization (in $bn)'].mean(),
-            'average_pe_ratio': industry_df['Long Term PE'].mean(),
-            'average_expected_dividend': industry_df['Expected dividend'].mean(),
-            'top_performers': industry_df.nlargest(3, 'Stars')[['Ticker', 'Name', 'Stars']].to_dict('records'),
-            'evaluation_distribution': industry_df['Global Evaluation'].value_counts().to_dict(),
-            'valuation_distribution': industry_df['Valuation rating'].value_counts().to_dict()
-        }
+        if len(industries) == 1:
+            stats = _stock_data_cache["industry_stats"][industries[0]]
+        else:
+            stats = _industry_statistics(df.iloc[_category_positions('Industry', industry_name)])
+
+        overview = {'industry_name': industry_name}
+        overview.update(stats)
+        # The statistics belong to the load-time cache, so hand out copies of the nested containers
+        overview['top_performers'] = [dict(record) for record in stats['top_performers']]
+        overview['evaluation_distribution'] = dict(stats['evaluation_distribution'])
+        overview['valuation_distribution'] = dict(stats['valuation_distribution'])
 
         return overview
 
@@ -413,62 +727,52 @@ def search_stocks_by_criteria(criteria_dict: Dict[str, Any]) -> Dict[str, Any]:
         if df.empty:
             return {"error": "No data available", "stocks": []}
 
-        filtered_df = df.copy()
+        # Combine every criterion into one boolean mask and slice once
+        mask = np.ones(len(df), dtype=bool)
         applied_filters = []
 
-        # Apply filters based on criteria
         if 'min_stars' in criteria_dict:
-            filtered_df = filtered_df[filtered_df['Stars'] >= criteria_dict['min_stars']]
+            mask &= df['Stars'].to_numpy() >= criteria_dict['min_stars']
             applied_filters.append(f"Stars >= {criteria_dict['min_stars']}")
 
         if 'max_stars' in criteria_dict:
-            filtered_df = filtered_df[filtered_df['Stars'] <= criteria_dict['max_stars']]
+            mask &= df['Stars'].to_numpy() <= criteria_dict['max_stars']
             applied_filters.append(f"Stars <= {criteria_dict['max_stars']}")
 
         if 'min_ytd_performance' in criteria_dict:
-            filtered_df = filtered_df[filtered_df['Year to date performance'] >= criteria_dict['min_ytd_performance']]
+            mask &= df['Year to date performance'].to_numpy() >= criteria_dict['min_ytd_performance']
             applied_filters.append(f"YTD Performance >= {criteria_dict['min_ytd_performance']}")
 
         if 'max_pe_ratio' in criteria_dict:
-            filtered_df = filtered_df[filtered_df['Long Term PE'] <= criteria_dict['max_pe_ratio']]
+            mask &= df['Long Term PE'].to_numpy() <= criteria_dict['max_pe_ratio']
             applied_filters.append(f"PE Ratio <= {criteria_dict['max_pe_ratio']}")
 
         if 'valuation_rating' in criteria_dict:
-            filtered_df = filtered_df[filtered_df['Valuation rating'].str.contains(criteria_dict['valuation_rating'], case=False, na=False)]
+            mask &= _categorical_contains(df['Valuation rating'], criteria_dict['valuation_rating'])
             applied_filters.append(f"Valuation Rating: {criteria_dict['valuation_rating']}")
 
         if 'global_evaluation' in criteria_dict:
-            filtered_df = filtered_df[filtered_df['Global Evaluation'].str.contains(criteria_dict['global_evaluation'], case=False, na=False)]
+            mask &= _categorical_contains(df['Global Evaluation'], criteria_dict['global_evaluation'])
             applied_filters.append(f"Global Evaluation: {criteria_dict['global_evaluation']}")
 
         if 'sector' in criteria_dict:
-            filtered_df = filtered_df[filtered_df['Sector'].str.contains(criteria_dict['sector'], case=False, na=False)]
+            mask &= _positions_mask(len(df), _category_positions('Sector', criteria_dict['sector']))
             applied_filters.append(f"Sector: {criteria_dict['sector']}")
 
         if 'industry' in criteria_dict:
-            filtered_df = filtered_df[filtered_df['Industry'].str.contains(criteria_dict['industry'], case=False, na=False)]
+            mask &= _positions_mask(len(df), _category_positions('Industry', criteria_dict['industry']))
             applied_filters.append(f"Industry: {criteria_dict['industry']}")
 
+        filtered_df = df[mask]
+
         # Limit results
         limit = criteria_dict.get('limit', 20)
-        result_df = filtered_df.nlargest(limit, 'Stars')
+        result_df = _top_n(filtered_df, 'Stars', limit)
 
-        stocks_list = []
-        for _, row in result_df.iterrows():
-            stock_info = {
-                'ticker': row['Ticker'],
-                'isin': row['ISIN'],
-                'name': row['Name'],
-                'stars': row['Stars'],
-                'sector': row['Sector'],
-                'industry': row['Industry'],
-                'price': row['Price'],
-                'global_evaluation': row['Global Evaluation'],
-                'ytd_performance': row['Year to date performance'],
-                'valuation_rating': row['Valuation rating'],
-                'market_cap_bn': row['Martket Capitalization (in $bn)']
-            }
-            stocks_list.append(stock_info)
+        stocks_list = _stock_records(result_df, [
+            'Ticker', 'ISIN', 'Name', 'Stars', 'Sector', 'Industry', 'Price', 'Global Evaluation',
+            'Year to date performance', 'Valuation rating', 'Martket Capitalization (in $bn)'
+        ])
 
         return {
             "stocks": stocks_list,
@@ -482,11 +786,16 @@ def search_stocks_by_criteria(criteria_dict: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": str(e), "stocks": []}
 
 # Utility functions
+def _observed_counts(series: pd.Series) -> Dict[str, int]:
+    """Value counts of a categorical column, leaving out categories absent from the slice."""
+    counts = series.value_counts()
+    return counts[counts > 0].to_dict()
+
 def get_available_industries() -> List[str]:
     """Get list of all available industries."""
     try:
         df = load_stock_data()
-        return df['Industry'].unique().tolist() if not df.empty else []
+        return list(_stock_data_cache["industries"]) if not df.empty else []
     except:
         return []
 
@@ -494,10 +803,15 @@ def get_available_sectors() -> List[str]:
     """Get list of all available sectors."""
     try:
         df = load_stock_data()
-        return df['Sector'].unique().tolist() if not df.empty else []
+        return list(_stock_data_cache["sectors"]) if not df.empty else []
     except:
         return []
 
+def get_data_version() -> Optional[float]:
+    """Get the modification time of the loaded stock data, or None if no data is available."""
+    df = load_stock_data()
+    return _stock_data_cache["mtime"] if not df.empty else None
+
 if __name__ == "__main__":
     # Test the functions
     print("Testing CSV Data Processing Functions...")
@@ -5,8 +5,11 @@ This module provides function schemas and dispatching for OpenAI function callin
 to interact with CSV data processing functions.
 """
 
-import json
-from typing import Dict, Any, List
+import os
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+import fastjsonschema
+import orjson
 from backend.data_processor import (
     get_top_stocks_by_stars,
     filter_stocks_by_industry,
@@ -16,7 +19,8 @@ from backend.data_processor import (
     get_industry_overview,
     search_stocks_by_criteria,
     get_available_industries,
-    get_available_sectors
+    get_available_sectors,
+    get_data_version
 )
 
 # OpenAI Function Schemas
@@ -224,6 +228,25 @@ FUNCTION_SCHEMAS = [
     }
 ]
 
+# Serialized once at import; the schemas are never mutated after this point
+_SCHEMAS_JSON = orjson.dumps(FUNCTION_SCHEMAS)
+
+# orjson options for tool results; numpy scalars from the DataFrame stay numbers.
+# Results are sent to the model compact (indentation only costs tokens); set
+# PRETTY_FUNCTION_RESULTS=1 to indent them for debugging.
+PRETTY_FUNCTION_RESULTS = os.getenv("PRETTY_FUNCTION_RESULTS", "").lower() in ("1", "true", "yes")
+RESULT_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+if PRETTY_FUNCTION_RESULTS:
+    RESULT_JSON_OPTIONS |= orjson.OPT_INDENT_2
+
+def _available_industries() -> Dict[str, List[str]]:
+    """Wrap get_available_industries in the result shape expected by the model."""
+    return {"industries": get_available_industries()}
+
+def _available_sectors() -> Dict[str, List[str]]:
+    """Wrap get_available_sectors in the result shape expected by the model."""
+    return {"sectors": get_available_sectors()}
+
 # Function dispatcher
 FUNCTION_MAP = {
     "get_top_stocks_by_stars": get_top_stocks_by_stars,
@@ -233,14 +256,47 @@ FUNCTION_MAP = {
     "compare_stocks_performance": compare_stocks_performance,
     "get_industry_overview": get_industry_overview,
     "search_stocks_by_criteria": search_stocks_by_criteria,
-    "get_available_industries": lambda: {"industries": get_available_industries()},
-    "get_available_sectors": lambda: {"sectors": get_available_sectors()}
+    "get_available_industries": _available_industries,
+    "get_available_sectors": _available_sectors
 }
 
+# Read-only functions over the CSV data whose results can be memoized per data version
+CACHEABLE_FUNCTIONS = frozenset({
+    "get_top_stocks_by_stars",
+    "filter_stocks_by_industry",
+    "filter_stocks_by_sector",
+    "get_stock_details",
+    "compare_stocks_performance",
+    "get_industry_overview",
+    "search_stocks_by_criteria",
+    "get_available_industries",
+    "get_available_sectors"
+})
+FUNCTION_CACHE_SIZE = 1024
+
+# Dispatch tables indexed by function id (position in FUNCTION_MAP); names are
+# resolved to an id once per call and everything after that indexes tuples
+FUNCTION_IDS = {name: function_id for function_id, name in enumerate(FUNCTION_MAP)}
+FUNCTION_TABLE = tuple(FUNCTION_MAP.values())
+_CACHEABLE_TABLE = tuple(name in CACHEABLE_FUNCTIONS for name in FUNCTION_MAP)
+_CRITERIA_FUNCTION_ID = FUNCTION_IDS["search_stocks_by_criteria"]
+
+# Compiled argument validators, one per function id; defaults are left to the Python signatures
+_PARAMETER_SCHEMAS = {schema["name"]: schema["parameters"] for schema in FUNCTION_SCHEMAS}
+_VALIDATOR_TABLE = tuple(
+    fastjsonschema.compile(_PARAMETER_SCHEMAS[name], use_default=False) for name in FUNCTION_MAP
+)
+
 def execute_function(function_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute a function call from OpenAI with the given arguments.
 
+    Arguments are checked against the function's JSON schema first. Results of
+    CACHEABLE_FUNCTIONS are memoized on the function name, the canonical JSON of
+    the arguments and the stock data version, so a reload of the CSV never serves
+    stale results. They are stored as JSON bytes and parsed per call, so every
+    caller gets its own dict; results carrying an "error" are not memoized.
+
     Args:
         function_name: Name of the function to call
         arguments: Dictionary of function arguments
@@ -249,28 +305,29 @@ def execute_function(function_name: str, arguments: Dict[str, Any]) -> Dict[str,
         Function result as dictionary
     """
     try:
-        if function_name not in FUNCTION_MAP:
+        function_id = FUNCTION_IDS.get(function_name)
+        if function_id is None:
             return {
                 "error": f"Function '{function_name}' not found",
                 "available_functions": list(FUNCTION_MAP.keys())
             }
 
-        function = FUNCTION_MAP[function_name]
-
-        # Handle functions with no arguments
-        if not arguments:
-            if function_name in ["get_available_industries", "get_available_sectors"]:
-                return function()
-            else:
-                return function()
+        _VALIDATOR_TABLE[function_id](arguments)
 
-        # Handle functions with single dictionary argument (search_stocks_by_criteria)
-        if function_name == "search_stocks_by_criteria":
-            return function(arguments.get("criteria_dict", {}))
+        if _CACHEABLE_TABLE[function_id]:
+            args_key = orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS).decode()
+            try:
+                return orjson.loads(_cached_execute(function_id, args_key, get_data_version()))
+            except _UncachedResult as e:
+                return e.result
 
-        # Handle regular function calls
-        return function(**arguments)
+        return _dispatch(function_id, arguments)
 
+    except fastjsonschema.JsonSchemaException as e:
+        return {
+            "error": f"Invalid arguments for function '{function_name}': {e.message}",
+            "provided_arguments": arguments
+        }
     except TypeError as e:
         return {
             "error": f"Invalid arguments for function '{function_name}': {str(e)}",
@@ -282,6 +339,49 @@ def execute_function(function_name: str, arguments: Dict[str, Any]) -> Dict[str,
             "provided_arguments": arguments
         }
 
+class _UncachedResult(Exception):
+    """Carries a result out of _cached_execute without lru_cache storing it."""
+
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__()
+        self.result = result
+
+@lru_cache(maxsize=FUNCTION_CACHE_SIZE)
+def _cached_execute(function_id: int, args_key: str, data_version: Optional[float]) -> bytes:
+    """
+    Memoized _dispatch returning the serialized result; data_version only takes part in the cache key.
+
+    Raises:
+        _UncachedResult: If the result is an error dict (e.g. an unknown ticker)
+    """
+    result = _dispatch(function_id, orjson.loads(args_key))
+    if isinstance(result, dict) and "error" in result:
+        raise _UncachedResult(result)
+    return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=str)
+
+# Drop memoized results, e.g. after replacing the dataset in place
+execute_function.cache_clear = _cached_execute.cache_clear
+
+def _dispatch(function_id: int, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Call the function with the given id (see FUNCTION_IDS) with the given arguments.
+
+    Raises:
+        TypeError: If the arguments do not match the function signature
+    """
+    function = FUNCTION_TABLE[function_id]
+
+    # Handle functions with no arguments
+    if not arguments:
+        return function()
+
+    # Handle functions with single dictionary argument (search_stocks_by_criteria)
+    if function_id == _CRITERIA_FUNCTION_ID:
+        return function(arguments.get("criteria_dict", {}))
+
+    # Handle regular function calls
+    return function(**arguments)
+
 def get_function_schemas() -> List[Dict[str, Any]]:
     """
     Get all function schemas for OpenAI function calling.
@@ -291,6 +391,15 @@ def get_function_schemas() -> List[Dict[str, Any]]:
     """
     return FUNCTION_SCHEMAS
 
+def get_function_schemas_json() -> bytes:
+    """
+    Get all function schemas as pre-serialized JSON.
+
+    Returns:
+        UTF-8 encoded JSON array of the function schemas
+    """
+    return _SCHEMAS_JSON
+
 def process_openai_function_call(function_call: Dict[str, Any]) -> str:
     """
     Process a function call from OpenAI and return JSON result.
@@ -305,25 +414,25 @@ def process_openai_function_call(function_call: Dict[str, Any]) -> str:
         function_name = function_call.get("name")
         arguments_str = function_call.get("arguments", "{}")
 
-        # Parse arguments if they're a string
-        if isinstance(arguments_str, str):
-            arguments = json.loads(arguments_str) if arguments_str else {}
+        # Parse arguments if they're a string (or raw bytes)
+        if isinstance(arguments_str, (str, bytes)):
+            arguments = orjson.loads(arguments_str) if arguments_str else {}
         else:
             arguments = arguments_str
 
         result = execute_function(function_name, arguments)
-        return json.dumps(result, indent=2, default=str)
+        return orjson.dumps(result, option=RESULT_JSON_OPTIONS, default=str).decode()
 
-    except json.JSONDecodeError as e:
-        return json.dumps({
+    except orjson.JSONDecodeError as e:
+        return orjson.dumps({
             "error": f"Invalid JSON in function arguments: {str(e)}",
             "raw_arguments": arguments_str
-        })
+        }, default=str).decode()
     except Exception as e:
-        return json.dumps({
+        return orjson.dumps({
             "error": f"Error processing function call: {str(e)}",
             "function_call": function_call
-        })
+        }, default=str).decode()
 
 # Example usage patterns for documentation
 EXAMPLE_USAGE = {
@@ -6,17 +6,91 @@ for extracting insights from TheScreener PDF reports.
 """
 
 import os
+import re
+import heapq
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Union
+import threading
+import concurrent.futures
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Union, Tuple
 import json
 from pathlib import Path
 
+try:
+    from azure.ai.documentintelligence.aio import DocumentIntelligenceClient
+    from azure.core.credentials import AzureKeyCredential
+except ImportError:  # Extraction falls back to the mock result
+    DocumentIntelligenceClient = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # PDF processing configuration
-PDF_REPORTS_PATH = os.getenv("DATASET_PATH") + "2025-09-23_EN"
+if not os.getenv("DATASET_PATH"):
+    raise RuntimeError("DATASET_PATH environment variable is not set; it must point to the dataset directory")
+PDF_REPORTS_PATH = Path(os.environ["DATASET_PATH"]) / "2025-09-23_EN"
+# Worker threads used to search several PDF reports at once
+SEARCH_MAX_WORKERS = 8
+# Number of search results returned by search_pdf_content
+SEARCH_TOP_RESULTS = 10
+# Azure Document Intelligence model used for extraction
+AZURE_DI_MODEL_ID = "prebuilt-layout"
+
+# Keyword patterns used to categorize industry insights
+_TREND_RE = re.compile(r"trend|market|outlook", re.IGNORECASE)
+_GROWTH_RE = re.compile(r"growth|expansion|increase", re.IGNORECASE)
+
+# Keywords (lowercase) used to pick out financial tables and performance charts
+_FINANCIAL_TABLE_KEYWORDS = ("financial", "revenue", "profit", "balance")
+_PERFORMANCE_CHART_KEYWORDS = ("performance", "price", "return", "growth")
+
+def _reports_mtime(reports_path: Path) -> Optional[int]:
+    """Get the directory's modification time in ns, or None if it does not exist."""
+    try:
+        return os.stat(reports_path).st_mtime_ns
+    except OSError:
+        return None
+
+@lru_cache(maxsize=1)
+def _list_reports(reports_path: Path, mtime_ns: int) -> Tuple[str, ...]:
+    """
+    List the PDF report filenames in a directory.
+
+    mtime_ns only takes part in the cache key, so the listing is re-read
+    whenever the directory changes.
+
+    Args:
+        reports_path: Directory holding the PDF reports
+        mtime_ns: Current modification time of the directory
+
+    Returns:
+        Tuple of PDF filenames in directory order
+    """
+    with os.scandir(reports_path) as entries:
+        return tuple(
+            entry.name for entry in entries
+            if entry.name.endswith(".pdf") and not entry.name.startswith(".") and entry.is_file()
+        )
+
+@lru_cache(maxsize=1024)
+def _find_report(reports_path: Path, mtime_ns: int, stock_ticker: str) -> Optional[str]:
+    """
+    Find the first report whose filename contains the ticker.
+
+    Args:
+        reports_path: Directory holding the PDF reports
+        mtime_ns: Current modification time of the directory
+        stock_ticker: Stock ticker symbol
+
+    Returns:
+        Matching filename, or None if no report mentions the ticker
+    """
+    for name in _list_reports(reports_path, mtime_ns):
+        if stock_ticker in name:
+            return name
+    return None
 
 class PDFProcessor:
     """
@@ -27,18 +101,23 @@ class PDFProcessor:
         self.reports_path = PDF_REPORTS_PATH
         self.azure_endpoint = os.getenv('AZURE_DOC_INTELLIGENCE_ENDPOINT')
         self.azure_key = os.getenv('AZURE_DOC_INTELLIGENCE_KEY')
+        self.colpali_initialized = False
+        self._init_lock = threading.Lock()
         self._initialize_colpali()
 
     def _initialize_colpali(self):
-        """Initialize ColPali model for PDF retrieval."""
-        try:
-            # Placeholder for ColPali initialization
-            # In a real implementation, you would load the ColPali model here
-            logger.info("ColPali model initialized (placeholder)")
-            self.colpali_initialized = True
-        except Exception as e:
-            logger.error(f"Failed to initialize ColPali: {str(e)}")
-            self.colpali_initialized = False
+        """Initialize ColPali model for PDF retrieval (once, even under concurrent callers)."""
+        with self._init_lock:
+            if self.colpali_initialized:
+                return
+            try:
+                # Placeholder for ColPali initialization
+                # In a real implementation, you would load the ColPali model here
+                logger.info("ColPali model initialized (placeholder)")
+                self.colpali_initialized = True
+            except Exception as e:
+                logger.error(f"Failed to initialize ColPali: {str(e)}")
+                self.colpali_initialized = False
 
     def _get_pdf_path(self, stock_ticker: str) -> Optional[str]:
         """
@@ -50,27 +129,33 @@ class PDFProcessor:
         Returns:
             Path to PDF file if exists, None otherwise
         """
-        if not os.path.exists(self.reports_path):
+        mtime_ns = _reports_mtime(self.reports_path)
+        if mtime_ns is None:
             logger.warning(f"PDF reports directory not found: {self.reports_path}")
             return None
 
         # Look for PDF files that contain the ticker in their name
-        pdf_files = list(Path(self.reports_path).glob(f"*{stock_ticker}*.pdf"))
-        if pdf_files:
-            return str(pdf_files[0])
+        report = _find_report(self.reports_path, mtime_ns, stock_ticker)
+        if report:
+            return str(self.reports_path / report)
 
         # Fallback: look for any PDF files in the directory
-        all_pdfs = list(Path(self.reports_path).glob("*.pdf"))
+        all_pdfs = _list_reports(self.reports_path, mtime_ns)
         if all_pdfs:
             logger.info(f"No specific PDF found for {stock_ticker}, using first available PDF")
-            return str(all_pdfs[0])
+            return str(self.reports_path / all_pdfs[0])
 
         return None
 
-    def _extract_with_azure_di(self, pdf_path: str, query_context: str = None) -> Dict[str, Any]:
+    async def _extract_with_azure_di(self, pdf_path: str, query_context: str = None) -> Dict[str, Any]:
         """
         Extract information from PDF using Azure Document Intelligence.
 
+        Uses the async client when Azure credentials are configured and a mock
+        result otherwise. The client is opened per call: aio clients and their
+        aiohttp session are bound to the event loop that created them, and this
+        processor is shared by every loop in the process.
+
         Args:
             pdf_path: Path to PDF file
             query_context: Context for targeted extraction
@@ -79,27 +164,53 @@ class PDFProcessor:
             Extracted information dictionary
         """
         try:
-            # Placeholder for Azure Document Intelligence integration
-            # In a real implementation, you would use Azure SDK here
-
             if not os.path.exists(pdf_path):
                 return {"error": f"PDF file not found: {pdf_path}"}
 
-            # Mock extraction result
-            extracted_data = {
-                "text_content": f"Sample extracted text from {os.path.basename(pdf_path)}",
-                "tables": [],
-                "charts": [],
-                "key_figures": {
-                    "revenue": "Sample revenue data",
-                    "profit_margin": "Sample profit margin",
-                    "growth_rate": "Sample growth rate"
-                },
-                "analyst_insights": [
-                    "Sample analyst insight 1",
-                    "Sample analyst insight 2"
-                ]
-            }
+            if DocumentIntelligenceClient and self.azure_endpoint and self.azure_key:
+                pdf_bytes = await asyncio.to_thread(Path(pdf_path).read_bytes)
+                credential = AzureKeyCredential(self.azure_key)
+                async with DocumentIntelligenceClient(self.azure_endpoint, credential) as client:
+                    poller = await client.begin_analyze_document(
+                        AZURE_DI_MODEL_ID, pdf_bytes, content_type="application/octet-stream"
+                    )
+                    result = await poller.result()
+                extracted_data = {
+                    "text_content": result.content or "",
+                    "tables": [
+                        {
+                            "row_count": table.row_count,
+                            "column_count": table.column_count,
+                            "cells": [
+                                {"row": cell.row_index, "column": cell.column_index, "content": cell.content}
+                                for cell in table.cells
+                            ]
+                        }
+                        for table in result.tables or []
+                    ],
+                    "charts": [
+                        {"caption": figure.caption.content if figure.caption else ""}
+                        for figure in result.figures or []
+                    ],
+                    "key_figures": {},
+                    "analyst_insights": []
+                }
+            else:
+                # Mock extraction result
+                extracted_data = {
+                    "text_content": f"Sample extracted text from {os.path.basename(pdf_path)}",
+                    "tables": [],
+                    "charts": [],
+                    "key_figures": {
+                        "revenue": "Sample revenue data",
+                        "profit_margin": "Sample profit margin",
+                        "growth_rate": "Sample growth rate"
+                    },
+                    "analyst_insights": [
+                        "Sample analyst insight 1",
+                        "Sample analyst insight 2"
+                    ]
+                }
 
             logger.info(f"Successfully extracted data from {pdf_path}")
             return extracted_data
@@ -148,10 +259,102 @@ class PDFProcessor:
             logger.error(f"ColPali search failed: {str(e)}")
             return [{"error": f"Search failed: {str(e)}"}]
 
+    def _search_with_colpali_batch(self, pdf_paths: List[str], query: str) -> List[List[Dict[str, Any]]]:
+        """
+        Search several PDFs for the same query with ColPali retrieval.
+
+        Args:
+            pdf_paths: Paths to PDF files
+            query: Search query
+
+        Returns:
+            One list of relevant document patches/sections per PDF, in input order
+        """
+        if not self.colpali_initialized:
+            return [[{"error": "ColPali not initialized"}] for _ in pdf_paths]
+
+        # Placeholder for batched ColPali search
+        # In a real implementation, render the pages of all PDFs, embed them in one
+        # batched forward pass, embed the query once and score every page against it
+        # with a single multi-vector similarity call, then split the hits per PDF.
+        # Until then the per-document searches run concurrently on the shared pool.
+        if len(pdf_paths) == 1:
+            return [self._search_with_colpali(pdf_paths[0], query)]
+        return list(_get_search_executor().map(
+            lambda pdf_path: self._search_with_colpali(pdf_path, query), pdf_paths
+        ))
+
+# Processor shared by all public functions, so the ColPali model is loaded once per process
+_processor: Optional[PDFProcessor] = None
+_processor_lock = threading.Lock()
+
+def _get_processor() -> PDFProcessor:
+    """Get the shared PDFProcessor, creating it on first use."""
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = PDFProcessor()
+    return _processor
+
+# Thread pool shared by all searches, created on first multi-file search
+_search_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_search_executor_lock = threading.Lock()
+
+def _get_search_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Get the shared search thread pool, creating it on first use."""
+    global _search_executor
+    if _search_executor is None:
+        with _search_executor_lock:
+            if _search_executor is None:
+                _search_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=SEARCH_MAX_WORKERS, thread_name_prefix="pdf-search"
+                )
+    return _search_executor
+
+def _run_sync(async_fn, *args) -> Dict[str, Any]:
+    """
+    Run one of the *_async functions to completion from synchronous code.
+
+    asyncio.run cannot be used while an event loop is running in this thread
+    (e.g. when called from an async FastAPI handler), so in that case the
+    coroutine runs on a fresh event loop in a worker thread instead.
+
+    Args:
+        async_fn: Coroutine function to run
+        *args: Arguments for async_fn
+
+    Returns:
+        The coroutine's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(async_fn(*args))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-sync") as executor:
+        return executor.submit(lambda: asyncio.run(async_fn(*args))).result()
+
 def extract_stock_context(stock_ticker: str, pdf_path: str = None) -> Dict[str, Any]:
     """
     Extract stock-specific context from PDF reports.
 
+    Runs extract_stock_context_async to completion (see _run_sync); async callers
+    should await that directly.
+
+    Args:
+        stock_ticker: Stock ticker symbol
+        pdf_path: Optional specific PDF path
+
+    Returns:
+        Dict containing extracted stock context
+    """
+    return _run_sync(extract_stock_context_async, stock_ticker, pdf_path)
+
+async def extract_stock_context_async(stock_ticker: str, pdf_path: str = None) -> Dict[str, Any]:
+    """
+    Extract stock-specific context from PDF reports, overlapping the ColPali search with Azure DI.
+
     Args:
         stock_ticker: Stock ticker symbol
         pdf_path: Optional specific PDF path
@@ -160,7 +363,7 @@ def extract_stock_context(stock_ticker: str, pdf_path: str = None) -> Dict[str,
         Dict containing extracted stock context
     """
     try:
-        processor = PDFProcessor()
+        processor = _get_processor()
 
         if not pdf_path:
             pdf_path = processor._get_pdf_path(stock_ticker)
@@ -171,16 +374,18 @@ def extract_stock_context(stock_ticker: str, pdf_path: str = None) -> Dict[str,
                 "available_reports": _get_available_reports()
             }
 
-        # Use ColPali to find relevant sections about the stock
-        search_results = processor._search_with_colpali(
-            pdf_path,
-            f"financial analysis performance outlook {stock_ticker}"
-        )
-
-        # Extract detailed information using Azure DI
-        extraction_result = processor._extract_with_azure_di(
-            pdf_path,
-            f"Extract financial metrics and analysis for {stock_ticker}"
+        # Use ColPali to find relevant sections about the stock while Azure DI extracts
+        # the detailed information
+        search_results, extraction_result = await asyncio.gather(
+            asyncio.to_thread(
+                processor._search_with_colpali,
+                pdf_path,
+                f"financial analysis performance outlook {stock_ticker}"
+            ),
+            processor._extract_with_azure_di(
+                pdf_path,
+                f"Extract financial metrics and analysis for {stock_ticker}"
+            )
         )
 
         return {
@@ -195,6 +400,65 @@ def extract_stock_context(stock_ticker: str, pdf_path: str = None) -> Dict[str,
         logger.error(f"Error extracting stock context: {str(e)}")
         return {"error": str(e)}
 
+def _relevance_score(result: Dict[str, Any]) -> float:
+    """Sort key for search results; results without a score rank last."""
+    return result.get('relevance_score', 0)
+
+def _search_targets(processor: PDFProcessor, pdf_path: Optional[str]) -> Union[Dict[str, Any], Tuple[List[str], List[str]]]:
+    """
+    Resolve which PDF files a search covers.
+
+    Args:
+        processor: Shared PDF processor
+        pdf_path: Optional specific PDF path; all reports are searched if None
+
+    Returns:
+        Tuple of (PDF paths, source file names), or an error dict
+    """
+    if pdf_path:
+        if not os.path.exists(pdf_path):
+            return {"error": f"PDF file not found: {pdf_path}"}
+        return [pdf_path], [os.path.basename(pdf_path)]
+
+    # Search across all available PDF reports
+    mtime_ns = _reports_mtime(processor.reports_path)
+    if mtime_ns is None:
+        return {"error": f"PDF reports directory not found"}
+    source_names = list(_list_reports(processor.reports_path, mtime_ns))
+    if not source_names:
+        return {"error": "No PDF files found to search"}
+    return [str(processor.reports_path / name) for name in source_names], source_names
+
+def _merge_search_results(query: str, source_names: List[str],
+                          per_file_results: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Tag per-file search results with their source and keep the most relevant ones.
+
+    Args:
+        query: Search query
+        source_names: Source file name of each searched PDF
+        per_file_results: Search results of each PDF, in the same order
+
+    Returns:
+        Dict containing search results
+    """
+    all_results = []
+
+    for source_name, search_results in zip(source_names, per_file_results):
+        for result in search_results:
+            result['source_file'] = source_name
+            all_results.append(result)
+
+    # Keep the most relevant results (same order as a stable descending sort)
+    top_results = heapq.nlargest(SEARCH_TOP_RESULTS, all_results, key=_relevance_score)
+
+    return {
+        "query": query,
+        "total_results": len(all_results),
+        "searched_files": source_names,
+        "results": top_results
+    }
+
 def search_pdf_content(query: str, pdf_path: str = None) -> Dict[str, Any]:
     """
     Search for specific content across PDF reports.
@@ -207,44 +471,95 @@ def search_pdf_content(query: str, pdf_path: str = None) -> Dict[str, Any]:
         Dict containing search results
     """
     try:
-        processor = PDFProcessor()
+        processor = _get_processor()
 
-        if pdf_path:
-            if not os.path.exists(pdf_path):
-                return {"error": f"PDF file not found: {pdf_path}"}
-            pdf_files = [pdf_path]
-        else:
-            # Search across all available PDF reports
-            if not os.path.exists(processor.reports_path):
-                return {"error": f"PDF reports directory not found"}
-            pdf_files = list(Path(processor.reports_path).glob("*.pdf"))
-            pdf_files = [str(p) for p in pdf_files]
+        targets = _search_targets(processor, pdf_path)
+        if isinstance(targets, dict):
+            return targets
+        pdf_files, source_names = targets
 
-        if not pdf_files:
-            return {"error": "No PDF files found to search"}
+        per_file_results = processor._search_with_colpali_batch(pdf_files, query)
+        return _merge_search_results(query, source_names, per_file_results)
 
-        all_results = []
+    except Exception as e:
+        logger.error(f"Error searching PDF content: {str(e)}")
+        return {"error": str(e)}
 
-        for pdf_file in pdf_files:
-            search_results = processor._search_with_colpali(pdf_file, query)
-            for result in search_results:
-                result['source_file'] = os.path.basename(pdf_file)
-                all_results.append(result)
+async def search_pdf_content_async(query: str, pdf_path: str = None) -> Dict[str, Any]:
+    """
+    Search for specific content across PDF reports without blocking the event loop.
 
-        # Sort by relevance score if available
-        all_results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+    The search runs in a worker thread through _search_with_colpali_batch, the
+    same path as search_pdf_content.
 
-        return {
-            "query": query,
-            "total_results": len(all_results),
-            "searched_files": [os.path.basename(f) for f in pdf_files],
-            "results": all_results[:10]  # Return top 10 results
-        }
+    Args:
+        query: Search query
+        pdf_path: Optional specific PDF path
+
+    Returns:
+        Dict containing search results
+    """
+    try:
+        processor = _get_processor()
+
+        targets = _search_targets(processor, pdf_path)
+        if isinstance(targets, dict):
+            return targets
+        pdf_files, source_names = targets
+
+        per_file_results = await asyncio.to_thread(processor._search_with_colpali_batch, pdf_files, query)
+        return _merge_search_results(query, source_names, per_file_results)
 
     except Exception as e:
         logger.error(f"Error searching PDF content: {str(e)}")
         return {"error": str(e)}
 
+def _industry_search_query(industry_name: str) -> str:
+    """Build the search query used to find insights about an industry."""
+    return f"industry analysis trends outlook {industry_name} sector performance"
+
+def _categorize_insights(industry_name: str, search_results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Sort search results into the industry insight categories.
+
+    Args:
+        industry_name: Name of the industry
+        search_results: Result of search_pdf_content for the industry query
+
+    Returns:
+        Dict containing industry insights
+    """
+    # Process and structure industry insights
+    insights = {
+        "industry": industry_name,
+        "market_trends": [],
+        "growth_outlook": [],
+        "key_challenges": [],
+        "opportunities": [],
+        "competitive_landscape": []
+    }
+
+    # Extract structured insights from search results
+    for result in search_results.get("results", []):
+        content = result.get("content", "")
+        section = result.get("section", "")
+
+        # Categorize insights based on content and section
+        if _TREND_RE.search(content):
+            insights["market_trends"].append({
+                "insight": content,
+                "source": result.get("source_file", ""),
+                "relevance": result.get("relevance_score", 0)
+            })
+        elif _GROWTH_RE.search(content):
+            insights["growth_outlook"].append({
+                "insight": content,
+                "source": result.get("source_file", ""),
+                "relevance": result.get("relevance_score", 0)
+            })
+
+    return insights
+
 def get_industry_insights(industry_name: str, pdf_path: str = None) -> Dict[str, Any]:
     """
     Extract industry-specific insights from PDF reports.
@@ -258,42 +573,36 @@ def get_industry_insights(industry_name: str, pdf_path: str = None) -> Dict[str,
     """
     try:
         # Search for industry-related content
-        search_query = f"industry analysis trends outlook {industry_name} sector performance"
-        search_results = search_pdf_content(search_query, pdf_path)
+        search_results = search_pdf_content(_industry_search_query(industry_name), pdf_path)
 
         if "error" in search_results:
             return search_results
 
-        # Process and structure industry insights
-        insights = {
-            "industry": industry_name,
-            "market_trends": [],
-            "growth_outlook": [],
-            "key_challenges": [],
-            "opportunities": [],
-            "competitive_landscape": []
-        }
+        return _categorize_insights(industry_name, search_results)
 
-        # Extract structured insights from search results
-        for result in search_results.get("results", []):
-            content = result.get("content", "")
-            section = result.get("section", "")
-
-            # Categorize insights based on content and section
-            if any(keyword in content.lower() for keyword in ["trend", "market", "outlook"]):
-                insights["market_trends"].append({
-                    "insight": content,
-                    "source": result.get("source_file", ""),
-                    "relevance": result.get("relevance_score", 0)
-                })
-            elif any(keyword in content.lower() for keyword in ["growth", "expansion", "increase"]):
-                insights["growth_outlook"].append({
-                    "insight": content,
-                    "source": result.get("source_file", ""),
-                    "relevance": result.get("relevance_score", 0)
-                })
-
-        return insights
+    except Exception as e:
+        logger.error(f"Error getting industry insights: {str(e)}")
+        return {"error": str(e)}
+
+async def get_industry_insights_async(industry_name: str, pdf_path: str = None) -> Dict[str, Any]:
+    """
+    Extract industry-specific insights from PDF reports without blocking the event loop.
+
+    Args:
+        industry_name: Name of the industry
+        pdf_path: Optional specific PDF path
+
+    Returns:
+        Dict containing industry insights
+    """
+    try:
+        # Search for industry-related content
+        search_results = await search_pdf_content_async(_industry_search_query(industry_name), pdf_path)
+
+        if "error" in search_results:
+            return search_results
+
+        return _categorize_insights(industry_name, search_results)
 
     except Exception as e:
         logger.error(f"Error getting industry insights: {str(e)}")
@@ -303,6 +612,22 @@ def extract_charts_and_tables(stock_ticker: str, pdf_path: str = None) -> Dict[s
     """
     Extract charts and tables related to a specific stock.
 
+    Runs extract_charts_and_tables_async to completion (see _run_sync); async callers
+    should await that directly.
+
+    Args:
+        stock_ticker: Stock ticker symbol
+        pdf_path: Optional specific PDF path
+
+    Returns:
+        Dict containing extracted charts and tables
+    """
+    return _run_sync(extract_charts_and_tables_async, stock_ticker, pdf_path)
+
+async def extract_charts_and_tables_async(stock_ticker: str, pdf_path: str = None) -> Dict[str, Any]:
+    """
+    Extract charts and tables related to a specific stock without blocking the event loop.
+
     Args:
         stock_ticker: Stock ticker symbol
         pdf_path: Optional specific PDF path
@@ -311,7 +636,7 @@ def extract_charts_and_tables(stock_ticker: str, pdf_path: str = None) -> Dict[s
         Dict containing extracted charts and tables
     """
     try:
-        processor = PDFProcessor()
+        processor = _get_processor()
 
         if not pdf_path:
             pdf_path = processor._get_pdf_path(stock_ticker)
@@ -320,7 +645,7 @@ def extract_charts_and_tables(stock_ticker: str, pdf_path: str = None) -> Dict[s
             return {"error": f"No PDF report found for stock: {stock_ticker}"}
 
         # Extract using Azure Document Intelligence with focus on tables and charts
-        extraction_result = processor._extract_with_azure_di(
+        extraction_result = await processor._extract_with_azure_di(
             pdf_path,
             f"Extract all tables and charts related to {stock_ticker}"
         )
@@ -328,32 +653,38 @@ def extract_charts_and_tables(stock_ticker: str, pdf_path: str = None) -> Dict[s
         if "error" in extraction_result:
             return extraction_result
 
+        tables = extraction_result.get("tables", [])
+        charts = extraction_result.get("charts", [])
+
         return {
             "stock_ticker": stock_ticker,
             "pdf_source": os.path.basename(pdf_path),
-            "tables": extraction_result.get("tables", []),
-            "charts": extraction_result.get("charts", []),
-            "financial_tables": [
-                table for table in extraction_result.get("tables", [])
-                if any(keyword in str(table).lower() for keyword in ["financial", "revenue", "profit", "balance"])
-            ],
-            "performance_charts": [
-                chart for chart in extraction_result.get("charts", [])
-                if any(keyword in str(chart).lower() for keyword in ["performance", "price", "return", "growth"])
-            ]
+            "tables": tables,
+            "charts": charts,
+            "financial_tables": _filter_by_keywords(tables, _FINANCIAL_TABLE_KEYWORDS),
+            "performance_charts": _filter_by_keywords(charts, _PERFORMANCE_CHART_KEYWORDS)
         }
 
     except Exception as e:
         logger.error(f"Error extracting charts and tables: {str(e)}")
         return {"error": str(e)}
 
+def _filter_by_keywords(items: List[Any], keywords: Tuple[str, ...]) -> List[Any]:
+    """Keep the items whose text (lowercased once per item) contains any of the keywords."""
+    matches = []
+    for item in items:
+        text = str(item).lower()
+        if any(keyword in text for keyword in keywords):
+            matches.append(item)
+    return matches
+
 def _get_available_reports() -> List[str]:
     """Get list of available PDF reports."""
     try:
-        if not os.path.exists(PDF_REPORTS_PATH):
+        mtime_ns = _reports_mtime(PDF_REPORTS_PATH)
+        if mtime_ns is None:
             return []
-        pdf_files = list(Path(PDF_REPORTS_PATH).glob("*.pdf"))
-        return [os.path.basename(str(f)) for f in pdf_files]
+        return list(_list_reports(PDF_REPORTS_PATH, mtime_ns))
     except:
         return []
 
@@ -361,6 +692,21 @@ def get_pdf_summary(pdf_path: str) -> Dict[str, Any]:
     """
     Get a summary of PDF content using both ColPali and Azure DI.
 
+    Runs get_pdf_summary_async to completion (see _run_sync); async callers should
+    await that directly.
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        Dict containing PDF summary
+    """
+    return _run_sync(get_pdf_summary_async, pdf_path)
+
+async def get_pdf_summary_async(pdf_path: str) -> Dict[str, Any]:
+    """
+    Get a summary of PDF content, overlapping the ColPali search with Azure DI.
+
     Args:
         pdf_path: Path to PDF file
 
@@ -368,16 +714,18 @@ def get_pdf_summary(pdf_path: str) -> Dict[str, Any]:
         Dict containing PDF summary
     """
     try:
-        processor = PDFProcessor()
+        processor = _get_processor()
 
         if not os.path.exists(pdf_path):
             return {"error": f"PDF file not found: {pdf_path}"}
 
-        # Extract general content using Azure DI
-        extraction_result = processor._extract_with_azure_di(pdf_path, "Extract summary and key insights")
-
-        # Search for key sections using ColPali
-        key_sections = processor._search_with_colpali(pdf_path, "executive summary key findings recommendations")
+        # Extract general content using Azure DI while ColPali searches for key sections
+        extraction_result, key_sections = await asyncio.gather(
+            processor._extract_with_azure_di(pdf_path, "Extract summary and key insights"),
+            asyncio.to_thread(
+                processor._search_with_colpali, pdf_path, "executive summary key findings recommendations"
+            )
+        )
 
         return {
             "pdf_file": os.path.basename(pdf_path),
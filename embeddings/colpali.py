@@ -1,13 +1,79 @@
 import fitz  # PyMuPDF
 from PIL import Image
 import torch
+from torch.nn.attention import SDPBackend, sdpa_kernel
 
+from transformers import BitsAndBytesConfig
+from transformers.models.qwen2_vl.image_processing_qwen2_vl import smart_resize
 from transformers.utils.import_utils import is_flash_attn_2_available
 from colpali_engine.models import ColQwen2, ColQwen2Processor
 
 import numpy as np
-from typing import List, Optional, Tuple
-import io
+from typing import Iterator, List, Optional, Tuple
+import atexit
+import concurrent.futures
+import contextlib
+import copy
+import hashlib
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import warnings
+from collections import deque
+
+try:
+    from .page_render import discard_rendered_page, page_sizes, render_page, take_rendered_page
+except ImportError:  # Loaded as a top-level module (e.g. run from this directory)
+    from page_render import discard_rendered_page, page_sizes, render_page, take_rendered_page
+
+# Pages run through the processor in one call by generate_embeddings (rounded to whole batches)
+PROCESSOR_CHUNK_SIZE = 32
+
+# Processes rasterizing pages in parallel; PyMuPDF does not support multithreading,
+# so each render process opens its own copy of the document. They are spawned, so
+# scripts using the embedder need an if __name__ == "__main__" guard (see page_render)
+RENDER_WORKERS = min(8, os.cpu_count() or 1)
+
+# Suggested cache_dir for preprocessed page inputs
+DEFAULT_INPUTS_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "colpali")
+# Subdirectory of cache_dir remembering the content hash of each (path, size, mtime) seen
+INPUTS_CACHE_STAT_DIR = "by-stat"
+
+# Marks the end of the rendered pages in embed_pdf's page queue
+_END_OF_PAGES = object()
+# How often embed_pdf's producer re-checks for cancellation while the queue is full
+PAGE_QUEUE_POLL_SECONDS = 0.1
+
+# SDPA backends allowed in the forward pass; the math kernel stays as the fallback for
+# masks, dtypes and shapes the fused kernels reject (PyTorch tries them in this order)
+SDPA_BACKENDS = [SDPBackend.FLASH_ATTENTION, SDPBackend.EFFICIENT_ATTENTION, SDPBackend.MATH]
+
+# Render processes shared by all embedders, started on first multi-page render
+_render_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_render_executor_lock = threading.Lock()
+
+def _get_render_executor() -> concurrent.futures.ProcessPoolExecutor:
+    """Get the shared render process pool, creating it on first use."""
+    global _render_executor
+    if _render_executor is None:
+        with _render_executor_lock:
+            if _render_executor is None:
+                # spawn, not fork: forking a process that holds CUDA state and threads is unsafe
+                _render_executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+                atexit.register(_shutdown_render_executor)
+    return _render_executor
+
+def _shutdown_render_executor() -> None:
+    """Stop the shared render processes; the next render starts a new pool."""
+    global _render_executor
+    with _render_executor_lock:
+        executor, _render_executor = _render_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
 
 class PDFColPaliEmbedder:
     """
@@ -15,62 +81,711 @@ class PDFColPaliEmbedder:
     ColPali is a vision-language model designed for document retrieval.
     """
     
-    def __init__(self, model_name: str = "vidore/colqwen2-v1.0"):
+    def __init__(self, model_name: str = "vidore/colqwen2-v1.0", compile_model: bool = False,
+                 dpi: int = 150, quantization: Optional[str] = None,
+                 cache_page_images: bool = False, cache_dir: Optional[str] = None,
+                 fit_to_model_grid: bool = True, verbose: bool = False):
         """
         Initialize the PDFColPaliEmbedder with ColPali model.
         
         Args:
             model_name (str): HuggingFace model name for ColPali
+            compile_model (bool): Compile the model with torch.compile (CUDA only); each new
+                input shape triggers a recompile, so this pays off for uniformly sized pages
+            dpi (int): Rasterization resolution for PDF pages; the processor downsamples
+                pages to a fixed patch budget, so more than ~150-200 DPI is rarely useful
+                (with fit_to_model_grid it only sets the aspect-preserving starting size)
+            quantization (Optional[str]): Load weights quantized with bitsandbytes, "nf4"
+                (4-bit) or "int8" (CUDA only; on CPU a warning is issued and the
+                weights load at full precision)
+            cache_page_images (bool): Render all pages in load_pdf and keep them in
+                page_images (skipped on an inputs cache hit, since embedding then
+                needs no images); by default pages are rendered lazily while embedding
+            cache_dir (Optional[str]): Directory for caching processor outputs across runs,
+                keyed by the PDF contents, model and DPI (e.g. DEFAULT_INPUTS_CACHE_DIR);
+                used by both load_pdf/generate_embeddings and embed_pdf; None disables the cache
+            fit_to_model_grid (bool): Render pages straight at the size the processor
+                would resize them to, so its resize step is a no-op
+            verbose (bool): Print progress after every batch
         """
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        print(f"Using device: {self.device}")
+        # Half precision on GPU (bf16 where supported), full precision on CPU
+        if self.device.type == "cuda":
+            self.dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        else:
+            self.dtype = torch.float32
+        print(f"Using device: {self.device} ({self.dtype})")
+        
+        # FlashAttention-2 when installed, otherwise PyTorch's fused SDPA kernels;
+        # eager attention on CPU
+        if self.device.type == "cpu":
+            self.attn_implementation = "eager"
+        elif is_flash_attn_2_available():
+            self.attn_implementation = "flash_attention_2"
+        else:
+            self.attn_implementation = "sdpa"
+        
+        # Quantized weights cut memory traffic in the backbone's large linear layers
+        if quantization not in (None, "nf4", "int8"):
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        quantization_config = None
+        if quantization and self.device.type != "cuda":
+            # bitsandbytes kernels need CUDA; say so rather than silently loading full precision
+            warnings.warn(f"quantization={quantization!r} needs CUDA; loading {model_name} "
+                          f"unquantized in {self.dtype} on {self.device}")
+        elif quantization:
+            if quantization == "nf4":
+                quantization_config = BitsAndBytesConfig(
+                    load_in_4bit=True, bnb_4bit_quant_type="nf4", bnb_4bit_compute_dtype=self.dtype
+                )
+            else:
+                quantization_config = BitsAndBytesConfig(load_in_8bit=True)
         
         # Load ColPali model and processor
         self.processor = ColQwen2Processor.from_pretrained(model_name)
         self.model = ColQwen2.from_pretrained(
                         model_name,
-                        torch_dtype=torch.float32,
+                        torch_dtype=self.dtype,
                         device_map=self.device,  # or "mps" if on Apple Silicon
-                        attn_implementation="flash_attention_2" if is_flash_attn_2_available() else None,
+                        attn_implementation=self.attn_implementation,
+                        quantization_config=quantization_config,
                     ).eval()
         
+        # Host-to-device copies run on their own stream so they overlap with compute
+        self._copy_stream = torch.cuda.Stream() if self.device.type == "cuda" else None
+        
+        if compile_model and self.device.type == "cuda":
+            # reduce-overhead mode replays CUDA graphs for the capturable regions
+            self.model = torch.compile(self.model, mode="reduce-overhead", dynamic=False, fullgraph=False)
+        
+        # Patch grid the image processor resizes to (multiples of patch * merge size
+        # within its pixel budget), for rendering pages at the model's input size
+        image_processor = self.processor.image_processor
+        self._grid_factor = image_processor.patch_size * image_processor.merge_size
+        self._min_pixels = getattr(image_processor, "min_pixels", None) or image_processor.size["shortest_edge"]
+        self._max_pixels = getattr(image_processor, "max_pixels", None) or image_processor.size["longest_edge"]
+        self.fit_to_model_grid = fit_to_model_grid
+        
+        self.model_name = model_name
+        self.verbose = verbose
+        self.dpi = dpi
+        self.cache_dir = cache_dir
+        self.cache_page_images = cache_page_images
         self.pdf_path = None
         self.page_images = []
         self.embeddings = []
+        self._doc = None
+        self._doc_mtime_ns = None
+        self._num_pages = 0
+        self._inputs_cache_path = None
+        self._cached_inputs = None
     
     def load_pdf(self, pdf_path: str) -> None:
         """
-        Load a PDF file and convert pages to images.
+        Load a PDF file for embedding.
+        
+        Pages are rendered on demand by generate_embeddings unless the embedder
+        was created with cache_page_images=True, in which case they are all
+        converted to images here (unless the inputs cache already has them
+        preprocessed).
         
         Args:
             pdf_path (str): Path to the PDF file
         """
+        self.close()
         self.pdf_path = pdf_path
         self.page_images = []
         
         try:
-            doc = fitz.open(pdf_path)
-            print(f"Loaded PDF with {len(doc)} pages")
+            self._doc = fitz.open(pdf_path)
+            pdf_stat = os.stat(pdf_path)
+            self._doc_mtime_ns = pdf_stat.st_mtime_ns
+            self._num_pages = len(self._doc)
+            print(f"Loaded PDF with {self._num_pages} pages")
             
-            # Convert each page to image
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # Render page as image (300 DPI for good quality)
-                mat = fitz.Matrix(300/72, 300/72)  # 300 DPI scaling
-                pix = page.get_pixmap(matrix=mat)
-                
-                # Convert to PIL Image
-                img_data = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_data)).convert("RGB")
-                
-                self.page_images.append(image)
-                print(f"Converted page {page_num + 1} to image")
+            self._open_inputs_cache(pdf_path, pdf_stat)
+            
+            if self.cache_page_images and self._cached_inputs is None:
+                # Convert each page to image
+                self.page_images = list(self._iter_page_images(range(self._num_pages)))
+                print(f"Converted {self._num_pages} pages to images")
+            
+        except Exception as e:
+            self.close()
+            raise Exception(f"Error loading PDF: {str(e)}")
+    
+    def close(self) -> None:
+        """Close the currently loaded PDF document."""
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+        self._doc_mtime_ns = None
+        self._num_pages = 0
+        self._inputs_cache_path = None
+        self._cached_inputs = None
+    
+    def _iter_page_images(self, page_nums: List[int]) -> Iterator[Image.Image]:
+        """
+        Yield page images in order, rendering them unless page images are cached.
+        
+        Only the requested pages are rendered, in parallel on the shared render
+        processes when there are several, so just the pages in flight are held
+        in memory.
+        
+        Args:
+            page_nums (List[int]): Page numbers (0-indexed) to render, in order
+            
+        Yields:
+            Image.Image: Rendered page
+        """
+        if self.page_images:
+            for page_num in page_nums:
+                yield self.page_images[page_num]
+        elif len(page_nums) > 1 and RENDER_WORKERS > 1:
+            # Only the page sizes are read here; the processes open the file themselves
+            pages = [(page_num, self._doc[page_num].rect.width, self._doc[page_num].rect.height)
+                     for page_num in page_nums]
+            yield from self._render_in_processes(os.path.abspath(self.pdf_path), self._doc_mtime_ns, pages)
+        else:
+            for page_num in page_nums:
+                yield self._render_page(self._doc[page_num])
+    
+    def _fork(self) -> "PDFColPaliEmbedder":
+        """
+        Create an embedder that shares this one's model and processor.
+        
+        The copy has its own document state, copy stream and processor (the
+        fast tokenizer raises "Already borrowed" under concurrent calls), so
+        it can embed a different PDF from another thread.
+        
+        Returns:
+            PDFColPaliEmbedder: Embedder for use by one worker thread
+        """
+        worker = copy.copy(self)
+        worker.processor = copy.deepcopy(self.processor)
+        worker.pdf_path = None
+        worker.page_images = []
+        worker.embeddings = []
+        worker._doc = None
+        worker._doc_mtime_ns = None
+        worker._num_pages = 0
+        worker._inputs_cache_path = None
+        worker._cached_inputs = None
+        worker._copy_stream = torch.cuda.Stream() if self.device.type == "cuda" else None
+        return worker
+    
+    def _page_size(self, page_num: int) -> Tuple[int, int]:
+        """
+        Get the rendered (width, height) of a page without rendering it.
+        
+        Args:
+            page_num (int): Page number (0-indexed)
+            
+        Returns:
+            Tuple[int, int]: Size of the page image in pixels
+        """
+        if self.page_images:
+            image = self.page_images[page_num]
+            return image.width, image.height
+        page = self._doc[page_num]
+        rect = (page.rect * self._page_matrix(page)).irect
+        return rect.width, rect.height
+    
+    def _page_matrix(self, page: "fitz.Page") -> "fitz.Matrix":
+        """
+        Get the transform rasterizing a page at the configured DPI.
+        
+        Args:
+            page (fitz.Page): Page to render
+            
+        Returns:
+            fitz.Matrix: Page-to-pixel transform (see _page_scale)
+        """
+        return fitz.Matrix(*self._page_scale(page.rect.width, page.rect.height))
+    
+    def _page_scale(self, width: float, height: float) -> Tuple[float, float]:
+        """
+        Get the horizontal and vertical page-to-pixel scale for a page size.
+        
+        With fit_to_model_grid the scale is adjusted per axis so the page lands
+        exactly on the size the processor's smart_resize picks for it. The
+        processor then gets an image that already has its target size, and
+        PIL skips resampling an image to its own size. Needs no PyMuPDF
+        objects, so any thread may call it.
+        
+        Args:
+            width (float): Page width in points
+            height (float): Page height in points
+            
+        Returns:
+            Tuple[float, float]: Scale along x and y
+        """
+        scale = self.dpi / 72
+        if not self.fit_to_model_grid:
+            return scale, scale
+        grid_height, grid_width = smart_resize(
+            round(height * scale), round(width * scale), factor=self._grid_factor,
+            min_pixels=self._min_pixels, max_pixels=self._max_pixels
+        )
+        return grid_width / width, grid_height / height
+    
+    def _open_inputs_cache(self, pdf_path: str, pdf_stat: os.stat_result) -> None:
+        """
+        Point the embedder at the PDF's inputs cache entry, loading it if present.
+        
+        Does nothing when the embedder has no cache_dir.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            pdf_stat (os.stat_result): os.stat() result of the file
+        """
+        if self.cache_dir is None:
+            return
+        self._inputs_cache_path = os.path.join(self.cache_dir, self._inputs_cache_key(pdf_path, pdf_stat))
+        if os.path.isdir(self._inputs_cache_path):
+            self._cached_inputs = self._load_cached_inputs(self._inputs_cache_path)
+            print(f"Loaded preprocessed pages from {self._inputs_cache_path}")
+    
+    def _inputs_cache_key(self, pdf_path: str, pdf_stat: os.stat_result) -> str:
+        """
+        Hash a PDF's contents together with the settings that affect preprocessing.
+        
+        The digest is remembered under INPUTS_CACHE_STAT_DIR by the file's path,
+        size and modification time, so the contents are only hashed again when
+        the file changes (or is seen under a new path).
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            pdf_stat (os.stat_result): os.stat() result of the file
             
-            doc.close()
+        Returns:
+            str: Hex digest naming the cache entry
+        """
+        settings = f"|{self.model_name}|{self.dpi}|{self.fit_to_model_grid}"
+        stat_key = hashlib.sha256(
+            f"{os.path.abspath(pdf_path)}|{pdf_stat.st_size}|{pdf_stat.st_mtime_ns}{settings}".encode()
+        ).hexdigest()
+        stat_path = os.path.join(self.cache_dir, INPUTS_CACHE_STAT_DIR, stat_key)
+        try:
+            with open(stat_path) as f:
+                key = f.read().strip()
+            if len(key) == hashlib.sha256().digest_size * 2:
+                return key
+        except OSError:
+            pass
+        
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(settings.encode())
+        key = digest.hexdigest()
+        
+        tmp_path = f"{stat_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            os.makedirs(os.path.dirname(stat_path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                f.write(key)
+            os.replace(tmp_path, stat_path)
+        except OSError:
+            # Only costs a re-hash on the next load
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+        return key
+    
+    @staticmethod
+    def _load_cached_inputs(cache_path: str) -> List[Tuple[List[int], dict]]:
+        """
+        Memory-map the cached processor outputs written by _write_inputs_cache.
+        
+        The maps are copy-on-write, so tensors can wrap them without a copy
+        while the files on disk stay untouched.
+        
+        Args:
+            cache_path (str): Cache entry directory
+            
+        Returns:
+            List of (page numbers, processor outputs as arrays) per chunk
+        """
+        chunks = {}
+        for file_name in os.listdir(cache_path):
+            chunk, name = file_name[:-len(".npy")].split("_", 1)
+            chunks.setdefault(int(chunk[len("chunk"):]), {})[name] = np.load(
+                os.path.join(cache_path, file_name), mmap_mode="c")
+        return [(arrays.pop("pages").tolist(), arrays) for _, arrays in sorted(chunks.items())]
+    
+    def _write_inputs_cache(self, chunks: Iterator[Tuple[List[int], dict]]) -> Iterator[Tuple[List[int], dict]]:
+        """
+        Pass processed chunks through while saving them to the inputs cache.
+        
+        The entry is written to a temporary directory and only moved into place
+        once every chunk has been saved, so a partial run never leaves a
+        truncated entry behind.
+        
+        Args:
+            chunks (Iterator): (page numbers, processor outputs) per chunk
+            
+        Yields:
+            The chunks, unchanged
+        """
+        tmp_path = f"{self._inputs_cache_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        writing = True
+        try:
+            for c, (page_nums, inputs) in enumerate(chunks):
+                if writing:
+                    try:
+                        os.makedirs(tmp_path, exist_ok=True)
+                        np.save(os.path.join(tmp_path, f"chunk{c}_pages.npy"), np.asarray(page_nums))
+                        for k, v in inputs.items():
+                            np.save(os.path.join(tmp_path, f"chunk{c}_{k}.npy"), v.numpy())
+                    except OSError as e:
+                        # A cache failure must not interrupt embedding
+                        print(f"Could not write inputs cache: {str(e)}")
+                        writing = False
+                yield page_nums, inputs
+            if writing:
+                try:
+                    os.replace(tmp_path, self._inputs_cache_path)
+                except OSError:
+                    # Another run stored this entry first
+                    pass
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    
+    def embed_pdf(self, pdf_path: str, batch_size: int = 1) -> np.ndarray:
+        """
+        Render and embed a PDF in one pipelined pass.
+        
+        A background thread collects pages rasterized by the render processes
+        into a bounded queue while the calling thread embeds them, so rendering
+        overlaps with inference and the page images are never all held in
+        memory. PyMuPDF is only used inside the render processes, so several
+        threads may call embed_pdf at once (see PDFColPaliEmbedderPool).
+        
+        With a cache_dir, a cached PDF is embedded straight from its
+        preprocessed inputs without rendering, and a new one is cached while
+        it is embedded.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            batch_size (int): Number of images to process at once
             
+        Returns:
+            np.ndarray: Array of embeddings with shape (num_pages, embedding_dim)
+        """
+        self.close()
+        self.pdf_path = pdf_path
+        self.page_images = []
+        
+        try:
+            render_path = os.path.abspath(pdf_path)
+            pdf_stat = os.stat(render_path)
+            mtime_ns = pdf_stat.st_mtime_ns
+            self._open_inputs_cache(render_path, pdf_stat)
+            if self._cached_inputs is None:
+                sizes = _get_render_executor().submit(page_sizes, render_path, mtime_ns).result()
         except Exception as e:
             raise Exception(f"Error loading PDF: {str(e)}")
+        
+        if self._cached_inputs is not None:
+            self._num_pages = sum(len(page_nums) for page_nums, _ in self._cached_inputs)
+            return self.generate_embeddings(batch_size=batch_size)
+        
+        num_pages = len(sizes)
+        print(f"Loaded PDF with {num_pages} pages")
+        
+        page_queue = queue.Queue(maxsize=2 * batch_size)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._render_pages, args=(render_path, mtime_ns, sizes, page_queue, stop), daemon=True
+        )
+        producer.start()
+        
+        try:
+            batches = self._processed_batches(self._queued_batches(page_queue, batch_size))
+            if self._inputs_cache_path is not None:
+                # Each batch is stored as one chunk of consecutive pages
+                chunks = self._write_inputs_cache(self._batch_chunks(batches))
+                batches = self._chunked_batches(chunks, batch_size)
+            self.embeddings = self._embed_batches(batches, num_pages)
+        finally:
+            # Stop the producer even if embedding failed, so it never blocks on a full queue
+            stop.set()
+            self._drain_queue(page_queue)
+            producer.join()
+        print(f"Generated embeddings with shape: {self.embeddings.shape}")
+        
+        return self.embeddings
+    
+    def _render_page(self, page: "fitz.Page") -> Image.Image:
+        """
+        Rasterize a PDF page to an RGB image.
+        
+        Args:
+            page (fitz.Page): Page to render
+            
+        Returns:
+            Image.Image: Rendered page
+        """
+        # Render page as image at the configured DPI (or the model's grid size)
+        pix = page.get_pixmap(matrix=self._page_matrix(page), colorspace=fitz.csRGB, alpha=False)
+        
+        # The pixmap is already packed RGB (no alpha), so no .convert() pass is needed;
+        # samples_mv is a view on the pixmap, saving the bytes copy pix.samples makes
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+    
+    def _render_pages(self, pdf_path: str, mtime_ns: int, sizes: List[Tuple[float, float]],
+                      page_queue: queue.Queue, stop: threading.Event) -> None:
+        """
+        Producer for embed_pdf: render every page into the queue, then the end marker.
+        
+        Up to RENDER_WORKERS pages are rendered at a time on the render processes
+        and queued in page order. Errors are put on the queue and re-raised by
+        the consumer. Once stop is set the producer gives up, even while
+        waiting on a full queue.
+        
+        Args:
+            pdf_path (str): Absolute path to the PDF file
+            mtime_ns (int): Modification time of the file
+            sizes (List[Tuple[float, float]]): Page sizes in points
+            page_queue (queue.Queue): Queue receiving rendered pages
+            stop (threading.Event): Set by the consumer when it stops reading
+        """
+        rendered = self._render_in_processes(
+            pdf_path, mtime_ns, [(page_num, width, height) for page_num, (width, height) in enumerate(sizes)]
+        )
+        try:
+            for image in rendered:
+                if not self._put_until_stopped(page_queue, image, stop):
+                    return
+        except Exception as e:
+            self._put_until_stopped(page_queue, Exception(f"Error loading PDF: {str(e)}"), stop)
+        finally:
+            rendered.close()
+            self._put_until_stopped(page_queue, _END_OF_PAGES, stop)
+    
+    def _render_in_processes(self, pdf_path: str, mtime_ns: int,
+                             pages: List[Tuple[int, float, float]]) -> Iterator[Image.Image]:
+        """
+        Render pages on the shared render processes, yielding them in order.
+        
+        Up to RENDER_WORKERS pages are rendered at a time. Each page comes back
+        in shared memory and is copied once into its PIL image. Closing the
+        generator early cancels the pages still in flight and releases their
+        shared memory.
+        
+        Args:
+            pdf_path (str): Absolute path to the PDF file
+            mtime_ns (int): Modification time of the file
+            pages (List[Tuple[int, float, float]]): Page number and size in points of each page
+            
+        Yields:
+            Image.Image: Rendered page
+        """
+        executor = _get_render_executor()
+        in_flight = deque()
+        try:
+            for page_num, width, height in pages:
+                in_flight.append(executor.submit(
+                    render_page, pdf_path, mtime_ns, page_num, *self._page_scale(width, height)
+                ))
+                if len(in_flight) >= RENDER_WORKERS:
+                    yield take_rendered_page(*in_flight.popleft().result())
+            while in_flight:
+                yield take_rendered_page(*in_flight.popleft().result())
+        finally:
+            for future in in_flight:
+                discard_rendered_page(future)
+    
+    @staticmethod
+    def _put_until_stopped(page_queue: queue.Queue, item, stop: threading.Event) -> bool:
+        """
+        Put an item on the queue, waiting for space until stop is set.
+        
+        Returns:
+            bool: Whether the item was queued
+        """
+        while not stop.is_set():
+            try:
+                page_queue.put(item, timeout=PAGE_QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    @staticmethod
+    def _drain_queue(page_queue: queue.Queue) -> None:
+        """Drop everything left in the queue, releasing the rendered pages."""
+        try:
+            while True:
+                page_queue.get_nowait()
+        except queue.Empty:
+            pass
+    
+    @staticmethod
+    def _queued_batches(page_queue: queue.Queue, batch_size: int) -> Iterator[List[Image.Image]]:
+        """
+        Group rendered pages from the queue into batches.
+        
+        Args:
+            page_queue (queue.Queue): Queue filled by _render_pages
+            batch_size (int): Number of images per batch
+            
+        Yields:
+            List[Image.Image]: Page images of the next batch
+        """
+        batch = []
+        while True:
+            item = page_queue.get()
+            if item is _END_OF_PAGES:
+                break
+            if isinstance(item, Exception):
+                raise item
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _attention_context(self):
+        """
+        Prefer SDPA's fused flash / memory-efficient kernels, falling back to math.
+
+        Returns:
+            Context manager for the forward pass (a no-op unless SDPA runs on CUDA)
+        """
+        if self.attn_implementation != "sdpa":
+            return contextlib.nullcontext()
+        return sdpa_kernel(SDPA_BACKENDS)
+    
+    def _forward(self, inputs: dict) -> torch.Tensor:
+        """
+        Run the model on a processed batch.
+        
+        Args:
+            inputs (dict): Processor outputs already on the model device
+            
+        Returns:
+            torch.Tensor: Batch embeddings
+        """
+        with self._attention_context():
+            return self.model(**inputs)
+    
+    def _prepare_batch(self, inputs: dict, num_images: int) -> Tuple[dict, int]:
+        """
+        Start copying a processed batch to the device.
+        
+        On CUDA the tensors are pinned and copied asynchronously on the copy stream;
+        the caller must make the compute stream wait on it before using them.
+        
+        Args:
+            inputs (dict): Processor outputs for the batch (batch-first tensors)
+            num_images (int): Number of pages in the batch
+            
+        Returns:
+            Tuple of (device inputs, number of pages in the batch)
+        """
+        if self._copy_stream is None:
+            inputs = {
+                k: v.to(self.device, dtype=self.dtype if v.is_floating_point() else v.dtype)
+                for k, v in inputs.items()
+            }
+            return inputs, num_images
+        
+        device_inputs = {}
+        compute_stream = torch.cuda.current_stream()
+        with torch.cuda.stream(self._copy_stream):
+            for k, v in inputs.items():
+                v = v.pin_memory().to(self.device, non_blocking=True)
+                if v.is_floating_point():
+                    v = v.to(self.dtype)
+                # The tensor is consumed on the compute stream; keep the allocator from reusing it early
+                v.record_stream(compute_stream)
+                device_inputs[k] = v
+        return device_inputs, num_images
+    
+    def _processed_batches(self, batches: Iterator[List[Image.Image]]) -> Iterator[Tuple[dict, int]]:
+        """
+        Run the processor on each batch of page images.
+        
+        Args:
+            batches (Iterator[List[Image.Image]]): Page image batches
+            
+        Yields:
+            Tuple of (processor outputs, number of pages in the batch)
+        """
+        for batch_images in batches:
+            yield self.processor.process_images(batch_images), len(batch_images)
+    
+    def _processed_chunks(self, page_groups: List[List[int]], batch_size: int) -> Iterator[Tuple[List[int], dict]]:
+        """
+        Run the processor once per chunk of same-size pages.
+        
+        Args:
+            page_groups (List[List[int]]): Page numbers grouped by rendered size
+            batch_size (int): Number of images per batch (chunks hold whole batches)
+            
+        Yields:
+            Tuple of (page numbers in the chunk, processor outputs)
+        """
+        chunk_size = max(batch_size, PROCESSOR_CHUNK_SIZE // batch_size * batch_size)
+        for page_nums in page_groups:
+            for c in range(0, len(page_nums), chunk_size):
+                chunk = page_nums[c:c + chunk_size]
+                yield chunk, self.processor.process_images(list(self._iter_page_images(chunk)))
+    
+    def _cached_chunks(self) -> Iterator[Tuple[List[int], dict]]:
+        """
+        Read chunks back from the inputs cache as tensors.
+        
+        The tensors share memory with the memory-mapped arrays; pages are only
+        read from disk as the batches use them (and copied when pinned on CUDA).
+        
+        Yields:
+            Tuple of (page numbers in the chunk, processor outputs)
+        """
+        for page_nums, arrays in self._cached_inputs:
+            yield page_nums, {k: torch.from_numpy(np.asarray(v)) for k, v in arrays.items()}
+    
+    @staticmethod
+    def _batch_chunks(batches: Iterator[Tuple[dict, int]]) -> Iterator[Tuple[List[int], dict]]:
+        """
+        Label batches of consecutive pages with their page numbers, as inputs cache chunks.
+        
+        Unlike the chunks of generate_embeddings, such a chunk may mix page sizes
+        (padded to its largest page); re-slicing it keeps the padding, which the
+        attention mask hides from the model.
+        
+        Args:
+            batches (Iterator[Tuple[dict, int]]): (processor outputs, page count) per batch, in page order
+            
+        Yields:
+            Tuple of (page numbers in the batch, processor outputs)
+        """
+        start = 0
+        for inputs, num_images in batches:
+            yield list(range(start, start + num_images)), inputs
+            start += num_images
+    
+    @staticmethod
+    def _chunked_batches(chunks: Iterator[Tuple[List[int], dict]], batch_size: int) -> Iterator[Tuple[dict, int]]:
+        """
+        Slice processed chunks into batches.
+        
+        Pages within a chunk render to the same size, so slicing a chunk gives the
+        same tensors as processing each batch on its own.
+        
+        Args:
+            chunks (Iterator): (page numbers, processor outputs) per chunk
+            batch_size (int): Number of images per batch
+            
+        Yields:
+            Tuple of (processor outputs, number of pages in the batch)
+        """
+        for chunk, inputs in chunks:
+            for b in range(0, len(chunk), batch_size):
+                yield {k: v[b:b + batch_size] for k, v in inputs.items()}, len(chunk[b:b + batch_size])
     
     def generate_embeddings(self, batch_size: int = 1) -> np.ndarray:
         """
@@ -82,31 +797,115 @@ class PDFColPaliEmbedder:
         Returns:
             np.ndarray: Array of embeddings with shape (num_pages, embedding_dim)
         """
-        if not self.page_images:
+        num_pages = len(self.page_images) or self._num_pages
+        if not num_pages:
             raise ValueError("No PDF loaded. Call load_pdf() first.")
         
-        self.embeddings = []
+        print(f"Generating embeddings for {num_pages} pages...")
         
-        print(f"Generating embeddings for {len(self.page_images)} pages...")
-        
-        # Process images in batches
-        for i in range(0, len(self.page_images), batch_size):
-            batch_images = self.page_images[i:i + batch_size]
-            
-            with torch.no_grad():
-                inputs = self.processor.process_images(batch_images)
-                inputs = {k: v.to(self.device) for k, v in inputs.items()}
-                batch_embeddings = self.model(**inputs)
-                batch_embeddings = batch_embeddings.cpu().numpy()
-                self.embeddings.extend(batch_embeddings)
+        if self._cached_inputs is not None:
+            page_groups = [page_nums for page_nums, _ in self._cached_inputs]
+            chunks = self._cached_chunks()
+        else:
+            # Group pages by rendered size so every batch is shape-homogeneous (less padding,
+            # and compiled graphs get reused); batches keep page order within a group
+            shape_to_indices = {}
+            for page_num in range(num_pages):
+                shape_to_indices.setdefault(self._page_size(page_num), []).append(page_num)
             
-            print(f"Processed pages {i+1}-{min(i+batch_size, len(self.page_images))}")
+            page_groups = list(shape_to_indices.values())
+            chunks = self._processed_chunks(page_groups, batch_size)
+            if self._inputs_cache_path is not None:
+                chunks = self._write_inputs_cache(chunks)
         
-        self.embeddings = np.array(self.embeddings)
+        page_order = [page_num for page_nums in page_groups for page_num in page_nums]
+        
+        self.embeddings = self._embed_batches(
+            self._chunked_batches(chunks, batch_size), num_pages,
+            page_order=page_order if page_order != list(range(num_pages)) else None
+        )
         print(f"Generated embeddings with shape: {self.embeddings.shape}")
         
         return self.embeddings
     
+    def _embed_batches(self, batches: Iterator[Tuple[dict, int]], num_pages: int,
+                       page_order: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Embed processed batches, preparing each batch while the previous one runs.
+        
+        Args:
+            batches (Iterator[Tuple[dict, int]]): (processor outputs, page count) per batch
+            num_pages (int): Total number of pages in the batches
+            page_order (Optional[List[int]]): Page number of each image in batch order,
+                if the batches are not in page order
+            
+        Returns:
+            np.ndarray: Array of embeddings with shape (num_pages, num_tokens, embedding_dim)
+        """
+        embeddings = None
+        pages_done = 0
+        
+        with torch.inference_mode():
+            batch = next(batches, None)
+            next_batch = self._prepare_batch(*batch) if batch else None
+            
+            # The next batch is fetched, processed and copied while the GPU runs the current one
+            while next_batch is not None:
+                inputs, num_images = next_batch
+                if self._copy_stream is not None:
+                    torch.cuda.current_stream().wait_stream(self._copy_stream)
+                batch_embeddings = self._forward(inputs)
+                
+                batch = next(batches, None)
+                next_batch = self._prepare_batch(*batch) if batch else None
+                
+                embeddings = self._store_batch(embeddings, num_pages, pages_done, batch_embeddings)
+                
+                if self.verbose:
+                    print(f"Processed pages {pages_done + 1}-{pages_done + num_images}")
+                pages_done += num_images
+        
+        if embeddings is None:
+            return np.empty(0, dtype=np.float32)
+        if page_order is not None:
+            # Scatter back to page order with one gather on the device
+            embeddings = embeddings[torch.as_tensor(np.argsort(page_order), device=embeddings.device)]
+        # Single device-to-host copy (and sync) at the end; NumPy has no bfloat16,
+        # so hand back float32 embeddings
+        return embeddings.float().cpu().numpy()
+    
+    @staticmethod
+    def _store_batch(embeddings: Optional[torch.Tensor], num_pages: int, start: int,
+                     batch_embeddings: torch.Tensor) -> torch.Tensor:
+        """
+        Write a batch into the preallocated embeddings tensor on the model device.
+        
+        The tensor is allocated on the first batch. Batches are padded to their
+        longest page, so when a later batch has more tokens the token axis is
+        grown; shorter pages keep zero vectors in the padding, as ColPali's own
+        attention-masked padding does. Copies are asynchronous, so the loop
+        never waits on the GPU.
+        
+        Args:
+            embeddings (Optional[torch.Tensor]): Tensor so far, or None before the first batch
+            num_pages (int): Total number of pages
+            start (int): Page index of the first page in the batch
+            batch_embeddings (torch.Tensor): Batch embeddings (pages, tokens, dim)
+            
+        Returns:
+            torch.Tensor: The (possibly reallocated) embeddings tensor
+        """
+        num_tokens = batch_embeddings.shape[1]
+        if embeddings is None:
+            embeddings = batch_embeddings.new_zeros((num_pages,) + tuple(batch_embeddings.shape[1:]))
+        elif num_tokens > embeddings.shape[1]:
+            grown = embeddings.new_zeros((num_pages, num_tokens) + tuple(embeddings.shape[2:]))
+            grown[:, :embeddings.shape[1]] = embeddings
+            embeddings = grown
+        
+        embeddings[start:start + len(batch_embeddings), :num_tokens].copy_(batch_embeddings, non_blocking=True)
+        return embeddings
+    
     def get_embedding(self, page_num: int) -> Optional[np.ndarray]:
         """
         Get the embedding for a specific page.
@@ -121,6 +920,69 @@ class PDFColPaliEmbedder:
             return self.embeddings[page_num]
         return None
 
+
+class PDFColPaliEmbedderPool:
+    """
+    Embed several PDFs concurrently with one shared ColPali model.
+    
+    Each worker thread has its own embedder view (with its own processor) and
+    CUDA stream, so the small forward passes of different documents overlap on
+    the GPU instead of running one PDF after another. Pages are rasterized on
+    the shared render processes, never on the worker threads.
+    """
+    
+    def __init__(self, num_workers: int = 2, **embedder_kwargs):
+        """
+        Load the model once and set up the worker threads.
+        
+        Args:
+            num_workers (int): Number of PDFs embedded at the same time
+            **embedder_kwargs: Arguments for PDFColPaliEmbedder
+        """
+        self.embedder = PDFColPaliEmbedder(**embedder_kwargs)
+        self._workers = queue.Queue()
+        for _ in range(num_workers):
+            stream = torch.cuda.Stream() if self.embedder.device.type == "cuda" else None
+            self._workers.put((self.embedder._fork(), stream))
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="colpali-embed")
+    
+    def embed_pdf_async(self, pdf_path: str, batch_size: int = 1) -> concurrent.futures.Future:
+        """
+        Queue a PDF for embedding.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            batch_size (int): Number of images to process at once
+            
+        Returns:
+            concurrent.futures.Future: Resolves to the PDF's embeddings (see embed_pdf)
+        """
+        return self._executor.submit(self._embed_pdf, pdf_path, batch_size)
+    
+    def _embed_pdf(self, pdf_path: str, batch_size: int) -> np.ndarray:
+        """
+        Embed a PDF on an idle worker, inside that worker's CUDA stream.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            batch_size (int): Number of images to process at once
+            
+        Returns:
+            np.ndarray: Embeddings of the PDF's pages
+        """
+        worker, stream = self._workers.get()
+        try:
+            with torch.cuda.stream(stream) if stream is not None else contextlib.nullcontext():
+                return worker.embed_pdf(pdf_path, batch_size=batch_size)
+        finally:
+            self._workers.put((worker, stream))
+    
+    def close(self) -> None:
+        """Wait for queued PDFs and stop the worker threads."""
+        self._executor.shutdown(wait=True)
+
+
 # Example usage
 if __name__ == "__main__":
     # Initialize the embedder
@@ -0,0 +1,144 @@
+"""
+Page rasterization for PDFColPaliEmbedder's render processes.
+
+PyMuPDF does not support multithreaded use, so pages are rendered in
+separate processes that each keep their own open document. The render
+processes are started with spawn, which re-imports the caller's __main__
+module in every process: that module must keep its work behind an
+``if __name__ == "__main__":`` guard, and the processes only start quickly
+when it does not import heavy packages at top level (this module itself
+only imports PyMuPDF).
+
+Rendered pages are handed back through shared memory rather than pickled
+through the pool's pipe; the receiver unlinks each block (see
+take_rendered_page and discard_rendered_page).
+"""
+
+import fitz  # PyMuPDF
+import concurrent.futures
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Documents kept open by this process, so workers serving several embed_pdf calls
+# at once don't reopen files for every page
+MAX_OPEN_DOCUMENTS = 4
+
+# Open documents keyed by (path, modification time in ns), least recently used first
+_open_docs: "OrderedDict[Tuple[str, int], fitz.Document]" = OrderedDict()
+
+def _document(pdf_path: str, mtime_ns: int) -> "fitz.Document":
+    """
+    Get this process's open document for a file, reopening it when the file changes.
+
+    At most MAX_OPEN_DOCUMENTS stay open; the least recently used is closed first.
+
+    Args:
+        pdf_path (str): Absolute path to the PDF file
+        mtime_ns (int): Modification time of the file, so a replaced file is reopened
+
+    Returns:
+        fitz.Document: Open document
+    """
+    key = (pdf_path, mtime_ns)
+    doc = _open_docs.get(key)
+    if doc is not None:
+        _open_docs.move_to_end(key)
+        return doc
+
+    while len(_open_docs) >= MAX_OPEN_DOCUMENTS:
+        _open_docs.popitem(last=False)[1].close()
+    doc = _open_docs[key] = fitz.open(pdf_path)
+    return doc
+
+def page_sizes(pdf_path: str, mtime_ns: int) -> List[Tuple[float, float]]:
+    """
+    Get the (width, height) in points of every page.
+
+    Args:
+        pdf_path (str): Absolute path to the PDF file
+        mtime_ns (int): Modification time of the file
+
+    Returns:
+        List of page sizes in page order
+    """
+    return [(page.rect.width, page.rect.height) for page in _document(pdf_path, mtime_ns)]
+
+def render_page(pdf_path: str, mtime_ns: int, page_num: int, scale_x: float, scale_y: float) -> Tuple[int, int, str]:
+    """
+    Rasterize one page to packed RGB samples in a new shared memory block.
+
+    The block is left for the caller, which must unlink it once the samples
+    are read. The document stays open for the next page of the same file
+    (see _document).
+
+    Args:
+        pdf_path (str): Absolute path to the PDF file
+        mtime_ns (int): Modification time of the file, so a replaced file is reopened
+        page_num (int): Page number (0-indexed)
+        scale_x (float): Horizontal page-to-pixel scale
+        scale_y (float): Vertical page-to-pixel scale
+
+    Returns:
+        Tuple of (width, height, name of the shared memory block holding the RGB samples)
+    """
+    page = _document(pdf_path, mtime_ns)[page_num]
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale_x, scale_y), colorspace=fitz.csRGB, alpha=False)
+    samples = pix.samples_mv
+    block = shared_memory.SharedMemory(create=True, size=max(len(samples), 1))
+    try:
+        block.buf[:len(samples)] = samples
+    except BaseException:
+        block.unlink()
+        raise
+    finally:
+        block.close()
+    return pix.width, pix.height, block.name
+
+def take_rendered_page(width: int, height: int, block_name: str) -> "Image.Image":
+    """
+    Copy a page returned by render_page into a PIL image and unlink its shared memory.
+
+    Args:
+        width (int): Page width in pixels
+        height (int): Page height in pixels
+        block_name (str): Shared memory block holding the RGB samples
+
+    Returns:
+        Image.Image: Rendered page
+    """
+    # PIL is only needed by the receiving process, so the render processes never import it
+    from PIL import Image
+
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        with block.buf[:width * height * 3] as samples:
+            return Image.frombytes("RGB", (width, height), samples)
+    finally:
+        block.close()
+        block.unlink()
+
+def discard_rendered_page(future: concurrent.futures.Future) -> None:
+    """
+    Cancel a render_page call whose result will never be read, or unlink its block once it finishes.
+
+    Args:
+        future (concurrent.futures.Future): Pending or finished render_page call
+    """
+    if future.cancel():
+        return
+
+    def unlink(done: concurrent.futures.Future) -> None:
+        if done.cancelled() or done.exception() is not None:
+            return
+        try:
+            block = shared_memory.SharedMemory(name=done.result()[2])
+        except FileNotFoundError:
+            return
+        block.close()
+        block.unlink()
+
+    future.add_done_callback(unlink)
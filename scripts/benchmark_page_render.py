@@ -0,0 +1,101 @@
+"""
+Compare in-process page rendering with PDFColPaliEmbedder's render processes.
+
+Renders every page of a PDF at the embedder's default 150 DPI three ways:
+sequentially in this process (the single-worker path), on a spawned process
+pool returning the samples pickled through the pool's pipe, and on the pool
+returning them through shared memory (what the embedder does). The pool is
+started and warmed up before timing, as it is shared for the whole process.
+
+Usage:
+    python scripts/benchmark_page_render.py embeddings/example.pdf [--workers N] [--repeat N]
+"""
+
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import fitz  # PyMuPDF
+from embeddings.page_render import _document, page_sizes, render_page, take_rendered_page
+
+DPI = 150
+
+def render_page_pickled(pdf_path: str, mtime_ns: int, page_num: int, scale_x: float, scale_y: float):
+    """render_page variant returning the samples by value, pickled through the pipe."""
+    page = _document(pdf_path, mtime_ns)[page_num]
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale_x, scale_y), colorspace=fitz.csRGB, alpha=False)
+    return pix.width, pix.height, pix.samples
+
+def render_in_process(pdf_path: str, num_pages: int, scale: float) -> None:
+    """Render every page in this process, as PDFColPaliEmbedder._render_page does."""
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(num_pages):
+            pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=fitz.csRGB, alpha=False)
+            Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+
+def render_on_pool(executor, workers: int, render_fn, take_fn, pdf_path: str, mtime_ns: int,
+                   num_pages: int, scale: float) -> None:
+    """Render every page on the pool with up to `workers` pages in flight, in page order."""
+    in_flight = deque()
+    for page_num in range(num_pages):
+        in_flight.append(executor.submit(render_fn, pdf_path, mtime_ns, page_num, scale, scale))
+        if len(in_flight) >= workers:
+            take_fn(*in_flight.popleft().result())
+    while in_flight:
+        take_fn(*in_flight.popleft().result())
+
+def take_pickled_page(width: int, height: int, samples: bytes) -> Image.Image:
+    """Wrap samples returned by render_page_pickled in a PIL image."""
+    return Image.frombytes("RGB", (width, height), samples)
+
+def best_time(fn, repeat: int) -> float:
+    """Fastest of `repeat` runs of fn, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pdf_path")
+    parser.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pdf_path = os.path.abspath(args.pdf_path)
+    mtime_ns = os.stat(pdf_path).st_mtime_ns
+    num_pages = len(page_sizes(pdf_path, mtime_ns))
+    scale = DPI / 72
+    print(f"{num_pages} pages, {args.workers} render processes, {os.cpu_count()} CPUs")
+
+    in_process = best_time(lambda: render_in_process(pdf_path, num_pages, scale), args.repeat)
+    print(f"in process:             {in_process:.3f}s ({num_pages / in_process:.1f} pages/s)")
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        # Start every process and open the document in each before timing
+        list(executor.map(page_sizes, [pdf_path] * args.workers, [mtime_ns] * args.workers))
+
+        for label, render_fn, take_fn in [
+            ("pool, pickled samples:", render_page_pickled, take_pickled_page),
+            ("pool, shared memory:  ", render_page, take_rendered_page),
+        ]:
+            elapsed = best_time(lambda: render_on_pool(
+                executor, args.workers, render_fn, take_fn, pdf_path, mtime_ns, num_pages, scale
+            ), args.repeat)
+            print(f"{label}  {elapsed:.3f}s ({num_pages / elapsed:.1f} pages/s, "
+                  f"{in_process / elapsed:.2f}x in-process)")
+
+if __name__ == "__main__":
+    main()
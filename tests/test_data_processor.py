@@ -0,0 +1,111 @@
+"""
+Differential tests for the indexed industry/sector lookups in backend.data_processor.
+
+Each lookup is compared against the plain pandas substring filter the module
+originally used, on a small generated CSV.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import data_processor
+
+INDUSTRIES = ['Technology', 'Technology Hardware', 'Banks', 'Regional Banks', 'Insurance']
+SECTORS = ['Software', 'Semiconductors', 'Financials']
+EVALUATIONS = ['very negative', 'negative', 'neutral', 'positive', 'very positive']
+VALUATIONS = ['undervalued', 'fairly valued', 'overvalued']
+
+NUMERIC_COLUMNS = [
+    'Price', 'Martket Capitalization (in $bn)', 'Target Price', 'Year to date performance',
+    '4 weeks performance', 'Long Term PE', 'Long Term Growth', 'Return On equity',
+    'Earnings Before Interest & Taxes', 'Equity on Assets', 'Book Value / Price',
+    'Total Revenue (in Mio)', 'Net Income (in Mio)', 'Current Ratio', 'Long Term Debt',
+    'Revenues on Assets', 'Cash Flow on Revenues', 'Expected dividend'
+]
+
+def _stock_frame(rows: int = 200) -> pd.DataFrame:
+    """Generate raw stock data with the columns of the real CSV."""
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'ISIN': [f"DE{i:010d}" for i in range(rows)],
+        'Ticker': [f"T{i}" for i in range(rows)],
+        'Name': [f"Company {i}" for i in range(rows)],
+        'Sector': rng.choice(SECTORS, rows),
+        'Industry': rng.choice(INDUSTRIES, rows),
+        'Market': 'XETRA',
+        'Currency': 'EUR',
+        'Global Evaluation': rng.choice(EVALUATIONS, rows),
+        'Valuation rating': rng.choice(VALUATIONS, rows),
+        'Industry Global Evaluation': rng.choice(EVALUATIONS, rows),
+        'Stars': rng.integers(0, 5, rows),
+        'Sensitivity': 'low',
+        'Earnings revision trend': 'up',
+        'Technical trend': 'neutral',
+        'Reference index': 'DAX',
+    })
+    for column in NUMERIC_COLUMNS:
+        df[column] = rng.uniform(-50, 50, rows).round(2)
+    return df
+
+@pytest.fixture
+def raw_stocks(tmp_path, monkeypatch):
+    """Point data_processor at a generated CSV and return the raw frame."""
+    df = _stock_frame()
+    csv_path = tmp_path / data_processor.CSV_FILE
+    df.to_csv(csv_path, sep=";", encoding="iso-8859-1", index=False)
+
+    monkeypatch.setattr(data_processor, "_CSV_PATH", csv_path)
+    monkeypatch.setattr(data_processor, "_PARQUET_PATH", None)
+    monkeypatch.setitem(data_processor._stock_data_cache, "df", None)
+    return pd.read_csv(csv_path, sep=";", encoding="iso-8859-1")
+
+def _baseline_tickers(df: pd.DataFrame, column: str, name: str) -> set:
+    """Tickers selected by the original unindexed substring filter."""
+    return set(df[df[column].str.contains(name, case=False, na=False)]['Ticker'])
+
+@pytest.mark.parametrize("name", ["Technology", "banks", "Hardware", "Bank", "Nonexistent"])
+def test_filter_stocks_by_industry_matches_baseline(raw_stocks, name):
+    expected = _baseline_tickers(raw_stocks, 'Industry', name)
+    result = data_processor.filter_stocks_by_industry(name, limit=len(raw_stocks))
+
+    assert {stock['ticker'] for stock in result['stocks']} == expected
+    if expected:
+        assert result['total_in_industry'] == len(expected)
+
+@pytest.mark.parametrize("name", ["Software", "semi", "Financials"])
+def test_filter_stocks_by_sector_matches_baseline(raw_stocks, name):
+    expected = _baseline_tickers(raw_stocks, 'Sector', name)
+    result = data_processor.filter_stocks_by_sector(name, limit=len(raw_stocks))
+
+    assert {stock['ticker'] for stock in result['stocks']} == expected
+    assert result['total_in_sector'] == len(expected)
+
+@pytest.mark.parametrize("industry, sector", [("Technology", "Software"), ("Banks", "fin"), ("Hardware", None)])
+def test_search_stocks_by_criteria_matches_baseline(raw_stocks, industry, sector):
+    criteria = {'industry': industry, 'limit': len(raw_stocks)}
+    expected = _baseline_tickers(raw_stocks, 'Industry', industry)
+    if sector is not None:
+        criteria['sector'] = sector
+        expected &= _baseline_tickers(raw_stocks, 'Sector', sector)
+
+    result = data_processor.search_stocks_by_criteria(criteria)
+
+    assert {stock['ticker'] for stock in result['stocks']} == expected
+    assert result['total_matches'] == len(expected)
+
+@pytest.mark.parametrize("name", ["Insurance", "Banks", "technology", "Nonexistent"])
+def test_get_industry_overview_matches_baseline(raw_stocks, name):
+    industry_df = data_processor.load_stock_data()
+    industry_df = industry_df[industry_df['Industry'].str.contains(name, case=False, na=False)]
+    result = data_processor.get_industry_overview(name)
+
+    if industry_df.empty:
+        assert "error" in result
+        return
+
+    assert result['total_stocks'] == len(industry_df)
+    assert result['average_ytd_performance'] == pytest.approx(industry_df['Year to date performance'].mean())
+    assert result['average_pe_ratio'] == pytest.approx(industry_df['Long Term PE'].mean())
+    assert result['evaluation_distribution'] == data_processor._observed_counts(industry_df['Global Evaluation'])
+    assert result['valuation_distribution'] == data_processor._observed_counts(industry_df['Valuation rating'])